@@ -1,9 +1,14 @@
 """Conversation REST API routes - V1."""
 
-import uuid
-from typing import Optional
+import asyncio
+import os
+import stat
+from uuid import uuid4
+from typing import Any, Dict, Optional, Tuple, Type
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, Query
+
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, Request
+from fastapi.responses import Response
 
 from ...models.conversation import (
     ConversationResponse,
@@ -14,64 +19,124 @@ from ...models.conversation import (
     ConversationInputResponse,
     InputResponse
 )
+from ...models.common import StatusResponse
 from ...models.message import (
     MessageResponse,
     ConversationMessagesResponse,
     SyncMessagesResponse
 )
-from ...db import DatabaseConnection, ConversationRepository, WorkerRepository
-from ...db.database_models import ConversationDO
+from ...db import ConversationRepository, WorkerRepository
+from ...db.database_models import ConversationDO, WorkerDO
 from ...services import ConversationManager
 from ...services.file_manager import FileManager
 from ...workers import handlers
+from ...workers.v1 import BaseWorker
+from ...utils import json_codec, utcnow
 
 router = APIRouter(prefix="/api/v1/conversations", tags=["Conversations"])
 
-# Database connection (set by main.py)
-db_conn: DatabaseConnection = None
-# Conversation manager for file-based message storage (set by main.py)
-conv_manager: ConversationManager = None
-# File manager for file monitoring (set by main.py)
-file_manager: FileManager = None
+# 依赖对象由 main.py 在 lifespan 中挂到 app.state 上，按请求直接读取
 
 
-def get_conversation_repo() -> ConversationRepository:
+async def get_conversation_repo(request: Request) -> ConversationRepository:
     """Dependency to get conversation repository."""
-    if db_conn is None:
-        raise HTTPException(status_code=500, detail="Database not initialized")
-    return ConversationRepository(db_conn.conn)
+    return request.app.state.conversation_repo
 
 
-def get_conv_manager() -> ConversationManager:
+async def get_conv_manager(request: Request) -> ConversationManager:
     """Dependency to get conversation manager."""
-    if conv_manager is None:
-        raise HTTPException(status_code=500, detail="Conversation manager not initialized")
-    return conv_manager
+    return request.app.state.conv_manager
 
 
-def get_worker_repo() -> WorkerRepository:
+async def get_worker_repo(request: Request) -> WorkerRepository:
     """Dependency to get worker repository."""
-    if db_conn is None:
-        raise HTTPException(status_code=500, detail="Database not initialized")
-    return WorkerRepository(db_conn.conn)
+    return request.app.state.worker_repo
+
+
+async def get_file_manager(request: Request) -> FileManager:
+    """Dependency to get file manager."""
+    return request.app.state.file_manager
+
+
+def _resolve_worker(conversation: ConversationDO, worker_record: Optional[WorkerDO],
+                    file_manager: FileManager) -> Tuple[Type[BaseWorker], BaseWorker]:
+    """校验 worker 记录，按类型从 handlers 取出 worker 类并实例化"""
+    if not worker_record:
+        raise HTTPException(status_code=404, detail=f"Worker not found: {conversation.worker_id}")
+
+    worker_class = handlers.get(worker_record.type)
+    if not worker_class:
+        raise HTTPException(status_code=400, detail=f"Unknown worker type: {worker_record.type}")
+
+    return worker_class, worker_class(
+        env_vars=worker_record.env_vars,
+        command_params=worker_record.command_params,
+        file_manager=file_manager
+    )
+
+
+def _watch_session(worker_class: Type[BaseWorker], manager: ConversationManager,
+                   raw_conversation_id: str, conversation_id: str, worker_name: str) -> None:
+    """为支持监控的 worker 注册 session，并注入 conv_manager 引用供 watch 回调自动保存"""
+    if not worker_class._watches_sessions:
+        return
+    worker_class.activate_session(raw_conversation_id, conversation_id, worker_name)
+    if worker_class._conv_manager_ref is None:
+        worker_class._conv_manager_ref = manager
+
+
+async def _safety_sync(worker_instance: BaseWorker, manager: ConversationManager,
+                       raw_conversation_id: str, worker_name: str, conversation_id: str) -> None:
+    """后台兜底同步一次消息，防止 watch 激活晚于初始写入"""
+    try:
+        messages = await worker_instance.fetch_messages(raw_conversation_id)
+        if messages:
+            await asyncio.to_thread(manager.save_messages, worker_name, conversation_id, messages)
+    except Exception:
+        pass  # 非致命，后续 watch 或 polling 会补上
+
+
+async def _touch_conversation(conv_repo: ConversationRepository, conversation_id: str,
+                              last_activity: datetime) -> None:
+    """后台刷新 last_activity；async 包装保证和其它 DB 调用一样在事件循环线程执行"""
+    conv_repo.finalize_input(conversation_id, None, last_activity)
+
+
+def _stat_path(path: str) -> Tuple[bool, bool]:
+    """一次 stat 返回 (exists, is_dir)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False, False
+    return True, stat.S_ISDIR(st.st_mode)
 
 
 def _to_response(conv: ConversationDO) -> ConversationResponse:
     """Convert ConversationDO to ConversationResponse."""
-    return ConversationResponse(
-        id=conv.id,
-        worker_name=conv.worker_id,
-        name=conv.name,
-        project_path=conv.project_path,
-        created_at=conv.created_at,
-        last_activity=conv.last_activity,
-        is_current=conv.is_current,
-        raw_conversation_id=conv.raw_conversation_id,
-        metadata=conv.metadata
-    )
+    # trusted: from DB，字段类型已规范，跳过逐字段校验
+    return ConversationResponse.model_construct(**_to_json_dict(conv))
+
 
+def _to_json_dict(conv: ConversationDO) -> Dict[str, Any]:
+    """Convert ConversationDO to a plain dict with the ConversationResponse shape.
 
-@router.get("", response_model=ConversationListResponse)
+    Single source of the field mapping: _to_response builds the model from it.
+    """
+    return {
+        "id": conv.id,
+        "worker_name": conv.worker_id,
+        "name": conv.name,
+        "project_path": conv.project_path,
+        "created_at": conv.created_at,
+        "last_activity": conv.last_activity,
+        "is_current": conv.is_current,
+        "raw_conversation_id": conv.raw_conversation_id,
+        "metadata": conv.metadata,
+    }
+
+
+# 响应体直接由 json_codec 序列化，不经 response_model 校验；schema 仅用于 OpenAPI 文档
+@router.get("", response_class=Response, responses={200: {"model": ConversationListResponse}})
 async def list_conversations(
     worker_name: Optional[str] = Query(None, description="Filter by worker name"),
     repo: ConversationRepository = Depends(get_conversation_repo)
@@ -82,10 +147,13 @@ async def list_conversations(
     else:
         conversations = repo.list_all()
 
-    return ConversationListResponse(
-        conversations=[_to_response(c) for c in conversations],
-        total=len(conversations)
-    )
+    # 列表可能很长：直接拼 dict 交给 json_codec 序列化，不逐条构造模型；
+    # 输出与 ConversationListResponse 一致（naive datetime 同为 ISO 格式）
+    body = json_codec.dumps({
+        "conversations": [_to_json_dict(c) for c in conversations],
+        "total": len(conversations),
+    })
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("", response_model=ConversationResponse, status_code=201)
@@ -95,22 +163,20 @@ async def create_conversation(
     worker_repo: WorkerRepository = Depends(get_worker_repo)
 ):
     """Create a new conversation."""
-    from pathlib import Path
-
-    # 检查 project_path 是否存在且为目录
-    p = Path(request.project_path)
-    if not p.exists():
+    # 检查 project_path 是否存在且为目录（stat 放到线程里，避免阻塞事件循环）
+    exists, is_dir = await asyncio.to_thread(_stat_path, request.project_path)
+    if not exists:
         raise HTTPException(status_code=400, detail=f"project_path does not exist: {request.project_path}")
-    if not p.is_dir():
+    if not is_dir:
         raise HTTPException(status_code=400, detail=f"project_path is not a directory: {request.project_path}")
 
     worker = worker_repo.get(request.worker_name)
     if not worker:
         raise HTTPException(status_code=404, detail=f"Worker not found: {request.worker_name}")
 
-    now = datetime.utcnow()
+    now = utcnow()
     conversation = ConversationDO(
-        id=str(uuid.uuid4()),
+        id=str(uuid4()),
         worker_id=request.worker_name,
         project_path=request.project_path,
         name=request.name,
@@ -141,7 +207,7 @@ async def get_conversation(
     return _to_response(conversation)
 
 
-@router.delete("/{conversation_id}", response_model=dict)
+@router.delete("/{conversation_id}", response_model=StatusResponse)
 async def delete_conversation(
     conversation_id: str,
     conv_repo: ConversationRepository = Depends(get_conversation_repo),
@@ -154,18 +220,18 @@ async def delete_conversation(
         raise HTTPException(status_code=404, detail=f"Conversation not found: {conversation_id}")
 
     # Delete message file
-    manager.delete_conversation(conversation.worker_id, conversation_id)
+    await asyncio.to_thread(manager.delete_conversation, conversation.worker_id, conversation_id)
 
     if not conv_repo.delete(conversation_id):
         raise HTTPException(status_code=500, detail="Failed to delete conversation")
 
-    return {
-        "status": "deleted",
-        "message": f"Conversation {conversation_id} deleted successfully"
-    }
+    return StatusResponse.model_construct(
+        status="deleted",
+        message=f"Conversation {conversation_id} deleted successfully"
+    )
 
 
-@router.patch("/{conversation_id}", response_model=dict)
+@router.patch("/{conversation_id}", response_model=StatusResponse)
 async def rename_conversation(
     conversation_id: str,
     request: RenameConversationRequest,
@@ -180,10 +246,10 @@ async def rename_conversation(
     if not repo.update(conversation_id, {"name": request.new_name}):
         raise HTTPException(status_code=500, detail="Failed to rename conversation")
 
-    return {
-        "status": "success",
-        "message": f"Conversation renamed to '{request.new_name}'"
-    }
+    return StatusResponse.model_construct(
+        status="success",
+        message=f"Conversation renamed to '{request.new_name}'"
+    )
 
 
 @router.get("/{conversation_id}/inputs", response_model=ConversationInputResponse)
@@ -199,56 +265,36 @@ async def get_conversation_inputs(
     if not conversation:
         raise HTTPException(status_code=404, detail=f"Conversation not found: {conversation_id}")
 
-    inputs = manager.get_inputs(conversation.worker_id, conversation_id, limit=limit)
+    inputs = await asyncio.to_thread(manager.get_inputs, conversation.worker_id, conversation_id, limit=limit)
 
-    return ConversationInputResponse(
-        conversation_id=conversation_id,
-        inputs=[
-            InputResponse(
-                id=None,
-                conversation_id=conversation_id,
-                worker_name=conversation.worker_id,
-                role=m["role"],
-                content=m["content"],
-                timestamp=datetime.fromisoformat(m["timestamp"]),
-                metadata=m.get("metadata", {})
-            )
+    # 整个响应一次 model_validate，ISO 时间戳由 pydantic-core 直接解析，不再逐条 fromisoformat
+    return ConversationInputResponse.model_validate({
+        "conversation_id": conversation_id,
+        "inputs": [
+            {"id": None, "conversation_id": conversation_id, "worker_name": conversation.worker_id, **m}
             for m in inputs
         ],
-        total=len(inputs)
-    )
+        "total": len(inputs)
+    })
 
 
 @router.post("/{conversation_id}", response_model=InputResponse, status_code=201)
 async def create_input(
     conversation_id: str,
     request: CreateInputRequest,
+    background: BackgroundTasks,
     conv_repo: ConversationRepository = Depends(get_conversation_repo),
-    worker_repo: WorkerRepository = Depends(get_worker_repo),
-    manager: ConversationManager = Depends(get_conv_manager)
+    manager: ConversationManager = Depends(get_conv_manager),
+    file_manager: FileManager = Depends(get_file_manager)
 ):
     """Add an input to a conversation."""
-    conversation = conv_repo.get(conversation_id)
+    # 一次查询同时取回 conversation 和 worker 记录
+    conversation, worker_record = conv_repo.get_with_worker(conversation_id)
 
     if not conversation:
         raise HTTPException(status_code=404, detail=f"Conversation not found: {conversation_id}")
 
-    # Get worker record
-    worker_record = worker_repo.get(conversation.worker_id)
-    if not worker_record:
-        raise HTTPException(status_code=404, detail=f"Worker not found: {conversation.worker_id}")
-
-    # Get worker class from handlers registry
-    worker_class = handlers.get(worker_record.type)
-    if not worker_class:
-        raise HTTPException(status_code=400, detail=f"Unknown worker type: {worker_record.type}")
-
-    # Instantiate worker
-    worker_instance = worker_class(
-        env_vars=worker_record.env_vars,
-        command_params=worker_record.command_params,
-        file_manager=file_manager
-    )
+    worker_class, worker_instance = _resolve_worker(conversation, worker_record, file_manager)
 
     # Call worker based on whether we have a raw_conversation_id
     if conversation.raw_conversation_id is None:
@@ -258,19 +304,15 @@ async def create_input(
                 path=conversation.project_path,
                 message=request.content
             )
-            # Save raw_conversation_id back to conversation
-            conv_repo.update(conversation_id, {"raw_conversation_id": raw_conversation_id})
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to start conversation: {str(e)}")
+        # 会话已在代码工具侧创建：立即回写 raw_conversation_id（连同 last_activity 一次 UPDATE），
+        # 避免后续步骤失败导致会话孤立、下次输入又新开一个会话
+        conv_repo.finalize_input(conversation_id, raw_conversation_id, utcnow())
     else:
         # Continue existing conversation
         # 先注册 session 监控，再发消息，这样 watch 不会错过文件变更
-        if hasattr(worker_class, 'activate_session'):
-            worker_class.activate_session(
-                conversation.raw_conversation_id, conversation_id, conversation.worker_id
-            )
-        if hasattr(worker_class, '_conv_manager_ref') and worker_class._conv_manager_ref is None:
-            worker_class._conv_manager_ref = conv_manager
+        _watch_session(worker_class, manager, conversation.raw_conversation_id, conversation_id, conversation.worker_id)
         try:
             await worker_instance.continue_conversation(
                 raw_conversation_id=conversation.raw_conversation_id,
@@ -284,19 +326,12 @@ async def create_input(
     actual_raw_id = (raw_conversation_id
                      if conversation.raw_conversation_id is None
                      else conversation.raw_conversation_id)
-    if hasattr(worker_class, 'activate_session'):
-        worker_class.activate_session(actual_raw_id, conversation_id, conversation.worker_id)
-    # 注入 conv_manager 引用，供 watch 回调自动保存
-    if hasattr(worker_class, '_conv_manager_ref') and worker_class._conv_manager_ref is None:
-        worker_class._conv_manager_ref = conv_manager
+    _watch_session(worker_class, manager, actual_raw_id, conversation_id, conversation.worker_id)
 
-    # 立即执行一次 sync，防止 watch 激活晚于初始写入
-    try:
-        messages = await worker_instance.fetch_messages(actual_raw_id)
-        if messages:
-            manager.save_messages(conversation.worker_id, conversation_id, messages)
-    except Exception:
-        pass  # 非致命，后续 watch 或 polling 会补上
+    # 补一次 sync，防止 watch 激活晚于初始写入；放到响应之后执行，不占用请求延迟
+    background.add_task(
+        _safety_sync, worker_instance, manager, actual_raw_id, conversation.worker_id, conversation_id
+    )
 
     # Save input to local storage
     input_data = manager.add_input(
@@ -307,8 +342,10 @@ async def create_input(
         metadata=request.metadata
     )
 
-    # Update last_activity
-    conv_repo.update(conversation_id, {"last_activity": datetime.utcnow()})
+    # 继续对话：只刷新 last_activity，客户端不依赖它，放到响应之后执行
+    # （首次输入已在 start 之后同步写入）
+    if conversation.raw_conversation_id is not None:
+        background.add_task(_touch_conversation, conv_repo, conversation_id, utcnow())
 
     return InputResponse(
         id=None,
@@ -316,12 +353,17 @@ async def create_input(
         worker_name=conversation.worker_id,
         role=input_data["role"],
         content=input_data["content"],
-        timestamp=datetime.fromisoformat(input_data["timestamp"]),
+        timestamp=input_data["timestamp"],
         metadata=input_data.get("metadata", {})
     )
 
 
-@router.get("/{conversation_id}/messages", response_model=ConversationMessagesResponse)
+# 响应体由 JSONL 原始行拼接而成，不经 response_model 校验；schema 仅用于 OpenAPI 文档
+@router.get(
+    "/{conversation_id}/messages",
+    response_class=Response,
+    responses={200: {"model": ConversationMessagesResponse}}
+)
 async def get_conversation_messages(
     conversation_id: str,
     limit: int = Query(100, ge=1, le=1000),
@@ -334,24 +376,28 @@ async def get_conversation_messages(
     if not conversation:
         raise HTTPException(status_code=404, detail=f"Conversation not found: {conversation_id}")
 
-    messages = manager.get_messages(conversation.worker_id, conversation_id, limit=limit)
+    lines = await asyncio.to_thread(manager.get_messages_raw, conversation.worker_id, conversation_id, limit=limit)
 
-    return ConversationMessagesResponse(
-        conversation_id=conversation_id,
-        messages=messages,
-        total=len(messages)
-    )
+    # JSONL 每行已是 save_messages 序列化好的 MessageResponse（get_messages_raw 已剔除损坏行），
+    # 直接拼进响应体，省掉解析成模型再序列化回去的往返；结构与 ConversationMessagesResponse 一致
+    body = b"".join((
+        b'{"conversation_id":', json_codec.dumps(conversation_id),
+        b',"messages":[', ",".join(lines).encode(),
+        b'],"total":', str(len(lines)).encode(), b"}",
+    ))
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/{conversation_id}/messages/sync", response_model=SyncMessagesResponse)
 async def sync_conversation_messages(
     conversation_id: str,
     conv_repo: ConversationRepository = Depends(get_conversation_repo),
-    worker_repo: WorkerRepository = Depends(get_worker_repo),
-    manager: ConversationManager = Depends(get_conv_manager)
+    manager: ConversationManager = Depends(get_conv_manager),
+    file_manager: FileManager = Depends(get_file_manager)
 ):
     """Sync messages from code tool for a conversation."""
-    conversation = conv_repo.get(conversation_id)
+    # 一次查询同时取回 conversation 和 worker 记录
+    conversation, worker_record = conv_repo.get_with_worker(conversation_id)
 
     if not conversation:
         raise HTTPException(status_code=404, detail=f"Conversation not found: {conversation_id}")
@@ -359,22 +405,7 @@ async def sync_conversation_messages(
     if not conversation.raw_conversation_id:
         raise HTTPException(status_code=400, detail="Conversation has no raw_conversation_id, cannot sync")
 
-    # Get worker record
-    worker_record = worker_repo.get(conversation.worker_id)
-    if not worker_record:
-        raise HTTPException(status_code=404, detail=f"Worker not found: {conversation.worker_id}")
-
-    # Get worker class from handlers registry
-    worker_class = handlers.get(worker_record.type)
-    if not worker_class:
-        raise HTTPException(status_code=400, detail=f"Unknown worker type: {worker_record.type}")
-
-    # Instantiate worker
-    worker_instance = worker_class(
-        env_vars=worker_record.env_vars,
-        command_params=worker_record.command_params,
-        file_manager=file_manager
-    )
+    _, worker_instance = _resolve_worker(conversation, worker_record, file_manager)
 
     # Sync messages from code tool (already standardized by worker)
     try:
@@ -385,7 +416,7 @@ async def sync_conversation_messages(
         raise HTTPException(status_code=500, detail=f"Failed to sync messages: {str(e)}")
 
     # Save standardized messages to JSONL file (full overwrite)
-    synced_count = manager.save_messages(conversation.worker_id, conversation_id, messages)
+    synced_count = await asyncio.to_thread(manager.save_messages, conversation.worker_id, conversation_id, messages)
 
     return SyncMessagesResponse(
         conversation_id=conversation_id,
@@ -1,43 +1,39 @@
 """Worker REST API routes - V1."""
 
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import Response
 
-from ...models.worker import WorkerResponse, CreateWorkerRequest
-from ...db import DatabaseConnection, WorkerRepository
+from ...models.common import StatusResponse
+from ...models.worker import WorkerResponse, WorkerListResponse, WorkerTypesResponse, CreateWorkerRequest
+from ...db import WorkerRepository
 from ...db.database_models import WorkerDO
-from ...workers import handlers, default as default_type
+from ...workers import handlers, available_types, default as default_type
+from ...utils import utcnow
 
 router = APIRouter(prefix="/api/v1/workers", tags=["Workers"])
 
-# Database connection (set by main.py)
-db_conn: DatabaseConnection = None
 
+# Worker types response is static for the process lifetime, serialize it once
+_WORKER_TYPES_BODY = WorkerTypesResponse(
+    types=list(available_types),
+    default=default_type
+).model_dump_json().encode()
 
-def get_worker_repo() -> WorkerRepository:
-    """Dependency to get worker repository."""
-    if db_conn is None:
-        raise HTTPException(status_code=500, detail="Database not initialized")
-    return WorkerRepository(db_conn.conn)
 
+async def get_worker_repo(request: Request) -> WorkerRepository:
+    """Dependency to get worker repository (set on app.state by main.py)."""
+    return request.app.state.worker_repo
 
-@router.get("", response_model=dict)
+
+@router.get("", response_model=WorkerListResponse)
 async def list_workers(repo: WorkerRepository = Depends(get_worker_repo)):
     """List all workers."""
     workers = repo.list_all()
 
-    return {
-        "workers": [
-            WorkerResponse(
-                name=w.id,
-                type=w.type,
-                env_vars=w.env_vars,
-                command_params=w.command_params,
-                created_at=w.created_at
-            )
-            for w in workers
-        ]
-    }
+    # trusted: from DB，字段类型已规范，跳过逐字段校验
+    return WorkerListResponse.model_construct(
+        workers=[WorkerResponse.from_do(w) for w in workers]
+    )
 
 
 @router.post("", response_model=WorkerResponse, status_code=201)
@@ -54,7 +50,7 @@ async def create_worker(
     if request.type not in handlers:
         raise HTTPException(
             status_code=400,
-            detail=f"Unknown worker type: '{request.type}'. Available types: {list(handlers.keys())}"
+            detail=f"Unknown worker type: '{request.type}'. Available types: {list(available_types)}"
         )
 
     worker = WorkerDO(
@@ -62,28 +58,20 @@ async def create_worker(
         type=request.type,
         env_vars=request.env_vars or {},
         command_params=request.command_params or [],
-        created_at=datetime.utcnow()
+        created_at=utcnow()
     )
 
     if not repo.create(worker):
         raise HTTPException(status_code=500, detail="Failed to create worker")
 
-    return WorkerResponse(
-        name=worker.id,
-        type=worker.type,
-        env_vars=worker.env_vars,
-        command_params=worker.command_params,
-        created_at=worker.created_at
-    )
+    # WorkerDO 字段已是目标类型，跳过二次校验
+    return WorkerResponse.from_do(worker)
 
 
-@router.get("/types", response_model=dict)
+@router.get("/types", response_model=WorkerTypesResponse)
 async def list_worker_types():
     """List available worker types."""
-    return {
-        "types": list(handlers.keys()),
-        "default": default_type
-    }
+    return Response(content=_WORKER_TYPES_BODY, media_type="application/json")
 
 
 @router.get("/{worker_name}", response_model=WorkerResponse)
@@ -97,16 +85,11 @@ async def get_worker(
     if not worker:
         raise HTTPException(status_code=404, detail=f"Worker not found: {worker_name}")
 
-    return WorkerResponse(
-        name=worker.id,
-        type=worker.type,
-        env_vars=worker.env_vars,
-        command_params=worker.command_params,
-        created_at=worker.created_at
-    )
+    # trusted: from DB
+    return WorkerResponse.from_do(worker)
 
 
-@router.delete("/{worker_name}", response_model=dict)
+@router.delete("/{worker_name}", response_model=StatusResponse)
 async def delete_worker(
     worker_name: str,
     repo: WorkerRepository = Depends(get_worker_repo)
@@ -120,7 +103,7 @@ async def delete_worker(
     if not repo.delete(worker_name):
         raise HTTPException(status_code=500, detail="Failed to delete worker")
 
-    return {
-        "status": "deleted",
-        "message": f"Worker {worker_name} deleted successfully"
-    }
+    return StatusResponse.model_construct(
+        status="deleted",
+        message=f"Worker {worker_name} deleted successfully"
+    )
@@ -9,6 +9,9 @@ from ..utils.logger import get_app_logger
 class DatabaseConnection:
     """DuckDB connection manager."""
 
+    # Bump when the DDL in _init_schema changes
+    SCHEMA_VERSION = 1
+
     def __init__(self, db_path: str = "./data/worker_manager.db"):
         """
         Initialize database connection.
@@ -36,8 +39,22 @@ class DatabaseConnection:
             self.logger.error(f"Failed to connect to DuckDB: {e}")
             raise
 
+    def _schema_version(self) -> Optional[int]:
+        """Return the recorded schema version, or None on a fresh or pre-versioned database."""
+        try:
+            row = self.conn.execute("SELECT version FROM schema_meta").fetchone()
+        except duckdb.Error:
+            # Missing table (CatalogException) or anything unreadable: run the DDL
+            return None
+        return row[0] if row else None
+
     def _init_schema(self):
         """Initialize database schema."""
+        # Warm start: schema already at the current version, skip all DDL
+        if self._schema_version() == self.SCHEMA_VERSION:
+            return
+
+        self.conn.execute("BEGIN TRANSACTION")
         try:
             # Workers table
             self.conn.execute("""
@@ -65,22 +82,29 @@ class DatabaseConnection:
                 )
             """)
 
-            # Migration: add raw_conversation_id column if not exists
-            try:
-                self.conn.execute("""
-                    ALTER TABLE conversations ADD COLUMN IF NOT EXISTS raw_conversation_id VARCHAR
-                """)
-            except Exception:
-                pass  # Column already exists or table doesn't support ALTER
+            # Migration: add raw_conversation_id column if not exists.
+            # No try/except: inside the transaction a swallowed failure would abort
+            # every later statement, and IF NOT EXISTS already covers the "exists" case
+            self.conn.execute("""
+                ALTER TABLE conversations ADD COLUMN IF NOT EXISTS raw_conversation_id VARCHAR
+            """)
 
             # Create indexes
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_workers_type ON workers(type)")
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_conversations_worker ON conversations(worker_id)")
             self.conn.execute("CREATE INDEX IF NOT EXISTS idx_conversations_project ON conversations(project_path)")
 
+            # Record schema version so the next start can skip the DDL above
+            self.conn.execute(
+                "CREATE OR REPLACE TABLE schema_meta AS SELECT ?::INTEGER AS version",
+                [self.SCHEMA_VERSION]
+            )
+
+            self.conn.execute("COMMIT")
             self.logger.info("Database schema initialized successfully")
 
         except Exception as e:
+            self.conn.execute("ROLLBACK")
             self.logger.error(f"Failed to initialize database schema: {e}")
             raise
 
@@ -4,8 +4,10 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from ...utils.clock import utcnow
 
-@dataclass
+
+@dataclass(slots=True)
 class ConversationDO:
     """Conversation data object - maps to conversations table."""
 
@@ -13,8 +15,8 @@ class ConversationDO:
     worker_id: str
     project_path: str
     name: Optional[str] = None
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    last_activity: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utcnow)
+    last_activity: datetime = field(default_factory=utcnow)
     is_current: bool = False
     raw_conversation_id: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
@@ -4,8 +4,10 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List
 
+from ...utils.clock import utcnow
 
-@dataclass
+
+@dataclass(slots=True)
 class WorkerDO:
     """Worker data object - maps to workers table."""
 
@@ -13,4 +15,4 @@ class WorkerDO:
     type: str
     env_vars: Dict[str, str] = field(default_factory=dict)
     command_params: List[str] = field(default_factory=list)
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utcnow)
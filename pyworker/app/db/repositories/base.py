@@ -7,6 +7,9 @@ from ...utils.logger import get_app_logger
 class BaseRepository:
     """Base class for all repositories."""
 
+    # Shared app logger, resolved once at import instead of per instance
+    logger = get_app_logger()
+
     def __init__(self, conn: duckdb.DuckDBPyConnection):
         """
         Initialize repository with database connection.
@@ -15,4 +18,3 @@ class BaseRepository:
             conn: DuckDB connection instance
         """
         self.conn = conn
-        self.logger = get_app_logger()
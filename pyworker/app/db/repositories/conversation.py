@@ -1,10 +1,13 @@
 """Conversation repository for database operations."""
 
-import json
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+
 from .base import BaseRepository
 from ..database_models.conversation import ConversationDO
+from ..database_models.worker import WorkerDO
+from ...utils import json_codec
+from ...utils.clock import utcnow
 
 
 class ConversationRepository(BaseRepository):
@@ -22,7 +25,7 @@ class ConversationRepository(BaseRepository):
         """
         try:
             # Use string formatting to avoid prepared statement cache issues
-            metadata_json = json.dumps(conversation.metadata) if conversation.metadata else '{}'
+            metadata_json = json_codec.dumps_str(conversation.metadata) if conversation.metadata else '{}'
             raw_conv_id = f"'{conversation.raw_conversation_id}'" if conversation.raw_conversation_id else "NULL"
 
             sql = f"""
@@ -74,13 +77,61 @@ class ConversationRepository(BaseRepository):
                     last_activity=result[5],
                     is_current=result[6],
                     raw_conversation_id=result[7],
-                    metadata=json.loads(result[8]) if result[8] else {}
+                    metadata=json_codec.loads(result[8]) if result[8] else {}
                 )
             return None
         except Exception as e:
             self.logger.error(f"Failed to get conversation {conversation_id}: {e}")
             return None
 
+    def get_with_worker(self, conversation_id: str) -> Tuple[Optional[ConversationDO], Optional[WorkerDO]]:
+        """
+        Get a conversation together with its worker in one query.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            (ConversationDO, WorkerDO) tuple; either side is None if missing
+        """
+        try:
+            result = self.conn.execute("""
+                SELECT c.id, c.worker_id, c.project_path, c.name, c.created_at, c.last_activity,
+                       c.is_current, c.raw_conversation_id, c.metadata,
+                       w.id, w.type, w.env_vars, w.command_params, w.created_at
+                FROM conversations c
+                LEFT JOIN workers w ON w.id = c.worker_id
+                WHERE c.id = ?
+            """, [conversation_id]).fetchone()
+
+            if not result:
+                return None, None
+
+            conversation = ConversationDO(
+                id=result[0],
+                worker_id=result[1],
+                project_path=result[2],
+                name=result[3],
+                created_at=result[4],
+                last_activity=result[5],
+                is_current=result[6],
+                raw_conversation_id=result[7],
+                metadata=json_codec.loads(result[8]) if result[8] else {}
+            )
+            worker = None
+            if result[9] is not None:
+                worker = WorkerDO(
+                    id=result[9],
+                    type=result[10],
+                    env_vars=json_codec.loads(result[11]) if result[11] else {},
+                    command_params=json_codec.loads(result[12]) if result[12] else [],
+                    created_at=result[13]
+                )
+            return conversation, worker
+        except Exception as e:
+            self.logger.error(f"Failed to get conversation with worker {conversation_id}: {e}")
+            return None, None
+
     def list_by_worker(self, worker_id: str) -> List[ConversationDO]:
         """
         List conversations for a worker.
@@ -109,7 +160,7 @@ class ConversationRepository(BaseRepository):
                     last_activity=row[5],
                     is_current=row[6],
                     raw_conversation_id=row[7],
-                    metadata=json.loads(row[8]) if row[8] else {}
+                    metadata=json_codec.loads(row[8]) if row[8] else {}
                 )
                 for row in results
             ]
@@ -141,7 +192,7 @@ class ConversationRepository(BaseRepository):
                     last_activity=row[5],
                     is_current=row[6],
                     raw_conversation_id=row[7],
-                    metadata=json.loads(row[8]) if row[8] else {}
+                    metadata=json_codec.loads(row[8]) if row[8] else {}
                 )
                 for row in results
             ]
@@ -184,19 +235,13 @@ class ConversationRepository(BaseRepository):
             True if successful, False otherwise
         """
         try:
-            # Unset all current conversations for this worker
+            # Unset the old current conversation and set the new one in a single UPDATE
             self.conn.execute("""
                 UPDATE conversations
-                SET is_current = FALSE
+                SET is_current = (id = ?),
+                    last_activity = CASE WHEN id = ? THEN ? ELSE last_activity END
                 WHERE worker_id = ?
-            """, [worker_id])
-
-            # Set new current conversation
-            self.conn.execute("""
-                UPDATE conversations
-                SET is_current = TRUE, last_activity = ?
-                WHERE id = ? AND worker_id = ?
-            """, [datetime.utcnow(), conversation_id, worker_id])
+            """, [conversation_id, conversation_id, utcnow(), worker_id])
 
             self.conn.commit()
             return True
@@ -223,6 +268,32 @@ class ConversationRepository(BaseRepository):
             self.logger.error(f"Failed to delete conversation: {e}")
             return False
 
+    def finalize_input(self, conversation_id: str, raw_conversation_id: Optional[str],
+                       last_activity: datetime) -> bool:
+        """
+        Record the outcome of an input in a single UPDATE.
+
+        Args:
+            conversation_id: Conversation ID
+            raw_conversation_id: New raw conversation ID, or None to keep the current one
+            last_activity: Activity timestamp to store
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.conn.execute("""
+                UPDATE conversations
+                SET raw_conversation_id = COALESCE(?, raw_conversation_id),
+                    last_activity = ?
+                WHERE id = ?
+            """, [raw_conversation_id, last_activity, conversation_id])
+            self.conn.commit()
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to finalize input for conversation {conversation_id}: {e}")
+            return False
+
     def update(self, conversation_id: str, updates: Dict[str, Any]) -> bool:
         """
         Update conversation fields.
@@ -252,7 +323,7 @@ class ConversationRepository(BaseRepository):
 
             if 'metadata' in updates:
                 set_clauses.append("metadata = ?")
-                params.append(json.dumps(updates['metadata']))
+                params.append(json_codec.dumps_str(updates['metadata']))
 
             if not set_clauses:
                 return True
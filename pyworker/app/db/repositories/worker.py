@@ -1,9 +1,10 @@
 """Worker repository for database operations."""
 
-import json
 from typing import Optional, List
+
 from .base import BaseRepository
 from ..database_models.worker import WorkerDO
+from ...utils import json_codec
 
 
 class WorkerRepository(BaseRepository):
@@ -26,8 +27,8 @@ class WorkerRepository(BaseRepository):
             """, [
                 worker.id,
                 worker.type,
-                json.dumps(worker.env_vars),
-                json.dumps(worker.command_params),
+                json_codec.dumps_str(worker.env_vars),
+                json_codec.dumps_str(worker.command_params),
                 worker.created_at
             ])
             self.conn.commit()
@@ -58,8 +59,8 @@ class WorkerRepository(BaseRepository):
                 return WorkerDO(
                     id=result[0],
                     type=result[1],
-                    env_vars=json.loads(result[2]) if result[2] else {},
-                    command_params=json.loads(result[3]) if result[3] else [],
+                    env_vars=json_codec.loads(result[2]) if result[2] else {},
+                    command_params=json_codec.loads(result[3]) if result[3] else [],
                     created_at=result[4]
                 )
             return None
@@ -85,8 +86,8 @@ class WorkerRepository(BaseRepository):
                 WorkerDO(
                     id=row[0],
                     type=row[1],
-                    env_vars=json.loads(row[2]) if row[2] else {},
-                    command_params=json.loads(row[3]) if row[3] else [],
+                    env_vars=json_codec.loads(row[2]) if row[2] else {},
+                    command_params=json_codec.loads(row[3]) if row[3] else [],
                     created_at=row[4]
                 )
                 for row in results
@@ -3,9 +3,9 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 
-from .db import DatabaseConnection
+from .db import DatabaseConnection, ConversationRepository, WorkerRepository
 from .api.v1 import workers, conversations
 from .services import ConversationManager
 from .services.file_manager import FileManager
@@ -21,11 +21,11 @@ async def lifespan(app: FastAPI):
     fm = FileManager()
     fm.start()
 
-    # Inject dependencies into routers
-    workers.db_conn = db_conn
-    conversations.db_conn = db_conn
-    conversations.conv_manager = conv_manager
-    conversations.file_manager = fm
+    # Expose shared dependencies to routers via app.state
+    app.state.conversation_repo = ConversationRepository(db_conn.conn)
+    app.state.worker_repo = WorkerRepository(db_conn.conn)
+    app.state.conv_manager = conv_manager
+    app.state.file_manager = fm
 
     yield
 
@@ -55,10 +55,14 @@ async def root():
     return FileResponse("static/index.html")
 
 
+# 健康检查响应体固定不变，预先序列化，跳过每次请求的编码
+_HEALTH_BODY = b'{"status":"healthy","version":"1.0.0"}'
+
+
 @app.get("/health", tags=["System"])
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "version": "1.0.0"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 if __name__ == "__main__":
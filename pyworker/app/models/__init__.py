@@ -1,6 +1,7 @@
 """Pydantic models for API request/response."""
 
-from .worker import WorkerResponse, CreateWorkerRequest
+from .common import StatusResponse
+from .worker import WorkerResponse, WorkerListResponse, WorkerTypesResponse, CreateWorkerRequest
 from .conversation import (
     ConversationResponse,
     ConversationListResponse,
@@ -18,7 +19,10 @@ from .message import (
 )
 
 __all__ = [
+    "StatusResponse",
     "WorkerResponse",
+    "WorkerListResponse",
+    "WorkerTypesResponse",
     "CreateWorkerRequest",
     "ConversationResponse",
     "ConversationListResponse",
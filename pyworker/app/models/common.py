@@ -0,0 +1,10 @@
+"""Shared API models."""
+
+from pydantic import BaseModel, Field
+
+
+class StatusResponse(BaseModel):
+    """Response model for simple status operations (delete, rename, ...)."""
+
+    status: str = Field(description="Operation status")
+    message: str = Field(description="Human readable result message")
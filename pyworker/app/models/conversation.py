@@ -18,11 +18,6 @@ class ConversationResponse(BaseModel):
     raw_conversation_id: Optional[str] = Field(None, description="Platform-specific conversation ID")
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata")
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-
 
 class CreateConversationRequest(BaseModel):
     """Request model for creating a conversation."""
@@ -70,11 +65,6 @@ class InputResponse(BaseModel):
     timestamp: datetime = Field(description="Input timestamp")
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata")
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-
 
 class ConversationInputResponse(BaseModel):
     """Response model for conversation inputs."""
@@ -30,11 +30,6 @@ class MessageResponse(BaseModel):
     usage: Optional[Dict[str, Any]] = Field(None, description="Token usage info")
     error: Optional[str] = Field(None, description="Error message if any")
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
-
 
 class ConversationMessagesResponse(BaseModel):
     """Response model for conversation messages."""
@@ -2,9 +2,12 @@
 
 import re
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import TYPE_CHECKING, Optional, Dict, List
 from pydantic import BaseModel, Field, field_validator
 
+if TYPE_CHECKING:
+    from ..db.database_models import WorkerDO
+
 
 # Worker name pattern: alphanumeric, hyphens, underscores, 1-64 chars
 WORKER_NAME_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]{0,63}$')
@@ -40,7 +43,26 @@ class WorkerResponse(BaseModel):
     command_params: List[str]
     created_at: datetime
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    @classmethod
+    def from_do(cls, worker: "WorkerDO") -> "WorkerResponse":
+        """Build from a WorkerDO; DB fields are already typed, so validation is skipped."""
+        return cls.model_construct(
+            name=worker.id,
+            type=worker.type,
+            env_vars=worker.env_vars,
+            command_params=worker.command_params,
+            created_at=worker.created_at
+        )
+
+
+class WorkerListResponse(BaseModel):
+    """Response model for listing workers."""
+
+    workers: List[WorkerResponse] = Field(description="List of workers")
+
+
+class WorkerTypesResponse(BaseModel):
+    """Response model for available worker types."""
+
+    types: List[str] = Field(description="Registered worker types")
+    default: str = Field(description="Type used when none is given")
@@ -4,13 +4,21 @@ Stores messages in JSONL files with structure:
   data/conversations/{worker_name}/{uuid[:2]}/{uuid}.jsonl
 """
 
-import json
-from datetime import datetime
+import os
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+from pydantic import TypeAdapter
+
 from ..models.message import MessageResponse
-from ..utils import read_last_n_lines
+from ..utils import json_codec, read_last_n_lines, utcnow
+from ..utils.logger import get_app_logger
+
+logger = get_app_logger()
+
+# 整批消息拼成一个 JSON 数组，由 pydantic-core 一次解析校验
+_MESSAGE_LIST_ADAPTER = TypeAdapter(List[MessageResponse])
 
 
 class ConversationManager:
@@ -60,12 +68,12 @@ class ConversationManager:
         input_record = {
             "role": role,
             "content": content,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utcnow().isoformat(),
             "metadata": metadata or {}
         }
 
-        with open(file_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(input_record, ensure_ascii=False) + "\n")
+        with open(file_path, "ab") as f:
+            f.write(json_codec.dumps(input_record, append_newline=True))
 
         return input_record
 
@@ -90,13 +98,11 @@ class ConversationManager:
         """
         file_path = self._get_conversation_path(worker_name, conversation_id)
 
-        if not file_path.exists():
-            return []
-
-        # Read last N lines efficiently (returns in chronological order)
+        # Read last N lines efficiently (returns in chronological order);
+        # a missing file simply yields no lines
         lines = read_last_n_lines(file_path, limit)
 
-        return [json.loads(line) for line in lines if line.strip()]
+        return [json_codec.loads(line) for line in lines if line.strip()]
 
     def save_messages(
         self,
@@ -118,9 +124,18 @@ class ConversationManager:
         file_path = self._get_messages_path(worker_name, conversation_id)
         self._ensure_dir(file_path)
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            for msg in messages:
-                f.write(msg.model_dump_json() + "\n")
+        # 先拼成一整块 bytes 再一次写入，避免逐条 write；
+        # 写入同目录临时文件后 os.replace 原子替换，读方不会读到写了一半的文件
+        payload = "".join(msg.model_dump_json() + "\n" for msg in messages)
+        # 临时文件名带线程 id：watch 回调与手动 sync 可能在不同线程同时保存同一会话
+        tmp_path = file_path.with_name(f"{file_path.name}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
 
         return len(messages)
 
@@ -141,13 +156,45 @@ class ConversationManager:
         Returns:
             List of MessageResponse (chronological order, oldest first)
         """
-        file_path = self._get_messages_path(worker_name, conversation_id)
-
-        if not file_path.exists():
+        lines = self.get_messages_raw(worker_name, conversation_id, limit=limit)
+        if not lines:
             return []
+        return _MESSAGE_LIST_ADAPTER.validate_json(f"[{','.join(lines)}]")
 
-        lines = read_last_n_lines(file_path, limit)
-        return [MessageResponse.model_validate_json(line) for line in lines if line.strip()]
+    def get_messages_raw(
+        self,
+        worker_name: str,
+        conversation_id: str,
+        limit: int = 100
+    ) -> List[str]:
+        """
+        Get synced messages as raw JSON lines, without parsing.
+
+        Lines are written by save_messages from MessageResponse.model_dump_json(),
+        so each one is already a serialized MessageResponse. Lines that are not
+        valid JSON (half-written or damaged) are skipped, so callers can splice
+        the result straight into a JSON body.
+
+        Args:
+            worker_name: Worker name
+            conversation_id: Conversation ID
+            limit: Maximum number of messages to return
+
+        Returns:
+            List of JSON strings, in the same order get_messages returns
+        """
+        file_path = self._get_messages_path(worker_name, conversation_id)
+        lines = []
+        for line in read_last_n_lines(file_path, limit):
+            if not line.strip():
+                continue
+            try:
+                json_codec.loads(line)
+            except json_codec.JSONDecodeError:
+                logger.warning("Skipping malformed message line in %s", file_path)
+                continue
+            lines.append(line)
+        return lines
 
     def delete_conversation(self, worker_name: str, conversation_id: str) -> bool:
         """
@@ -164,12 +211,12 @@ class ConversationManager:
         messages_path = self._get_messages_path(worker_name, conversation_id)
 
         deleted = False
-        if input_path.exists():
-            input_path.unlink()
-            deleted = True
-        if messages_path.exists():
-            messages_path.unlink()
-            deleted = True
+        for path in (input_path, messages_path):
+            try:
+                path.unlink()
+                deleted = True
+            except FileNotFoundError:
+                pass
         return deleted
 
     def conversation_exists(self, worker_name: str, conversation_id: str) -> bool:
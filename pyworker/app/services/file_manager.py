@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 class FileManager:
     """通用文件监控服务，基于 watchfiles（Rust notify，原生 async）"""
 
+    # 目录监控循环与回调派发之间的队列容量
+    DISPATCH_QUEUE_SIZE = 1024
+
     def __init__(self):
         self._watches: Dict[str, List[FileChangeCallback]] = {}  # abs_path -> [callbacks]
         self._dir_watches: Dict[str, List[FileChangeCallback]] = {}  # dir_path -> [callbacks]
@@ -122,38 +125,79 @@ class FileManager:
             del self._dir_tasks[dir_path]
             logger.info(f"[FileManager] stopped watch loop for dir: {dir_path}")
 
+    def _is_watched(self, change: Change, path: str) -> bool:
+        """awatch 过滤器：只放行已注册监控的文件"""
+        return path in self._watches
+
     async def _watch_loop(self, dir_path: str):
-        """单个目录的监控循环"""
+        """单个目录的监控循环
+
+        只监控该目录本层（recursive=False），并用 _watches 查表代替默认的
+        正则过滤器，未注册的文件在进入批次前即被丢弃。
+        """
         try:
-            async for changes in awatch(dir_path, stop_event=self._stop_event):
+            async for changes in awatch(
+                dir_path,
+                stop_event=self._stop_event,
+                watch_filter=self._is_watched,
+                recursive=False,
+            ):
                 for change_type, changed_path in changes:
-                    abs_changed = str(Path(changed_path).resolve())
-                    if abs_changed in self._watches:
-                        for cb in list(self._watches[abs_changed]):
-                            try:
-                                await cb(Path(abs_changed))
-                            except Exception:
-                                logger.exception(
-                                    f"[FileManager] callback error for {abs_changed}"
-                                )
+                    # dir_path 已是 resolve 后的绝对路径，awatch 上报的路径与 _watches 的 key
+                    # 同构，直接查表即可；未监控的文件不再做 resolve()（逐级 lstat）
+                    callbacks = self._watches.get(changed_path)
+                    if not callbacks:
+                        continue
+                    path = Path(changed_path)
+                    for cb in list(callbacks):
+                        try:
+                            await cb(path)
+                        except Exception:
+                            logger.exception(
+                                f"[FileManager] callback error for {changed_path}"
+                            )
         except asyncio.CancelledError:
             logger.debug(f"[FileManager] watch loop cancelled for dir: {dir_path}")
         except Exception:
             logger.exception(f"[FileManager] watch loop error for dir: {dir_path}")
 
     async def _dir_watch_loop(self, dir_path: str):
-        """目录级监控循环：所有变更都派发给 callback（由 callback 自行过滤）"""
+        """目录级监控循环：所有变更都派发给 callback（由 callback 自行过滤）
+
+        变更经有界队列交给独立的派发 task 执行回调，慢回调（如消息同步）
+        不会阻塞 awatch 继续收取事件；队列满时对监控循环形成背压。
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.DISPATCH_QUEUE_SIZE)
+        dispatcher = asyncio.create_task(self._dispatch_dir_changes(dir_path, queue))
         try:
             async for changes in awatch(dir_path, stop_event=self._stop_event):
                 for change_type, changed_path in changes:
-                    for cb in list(self._dir_watches.get(dir_path, [])):
-                        try:
-                            await cb(Path(changed_path))
-                        except Exception:
-                            logger.exception(
-                                f"[FileManager] dir callback error for {changed_path}"
-                            )
+                    await queue.put(changed_path)
         except asyncio.CancelledError:
             logger.debug(f"[FileManager] dir watch loop cancelled for: {dir_path}")
         except Exception:
             logger.exception(f"[FileManager] dir watch loop error for: {dir_path}")
+        finally:
+            # 等派发 task 真正退出，避免回调执行到一半被孤立地销毁
+            dispatcher.cancel()
+            await asyncio.gather(dispatcher, return_exceptions=True)
+
+    async def _dispatch_dir_changes(self, dir_path: str, queue: asyncio.Queue):
+        """从队列取出变更路径，依次调用目录回调
+
+        每轮把队列中已积压的变更一次取空并按路径去重：连续写入同一文件
+        产生的多次事件只触发一次回调。
+        """
+        while True:
+            pending = {await queue.get(): None}
+            while not queue.empty():
+                pending[queue.get_nowait()] = None
+            for changed_path in pending:
+                path = Path(changed_path)
+                for cb in list(self._dir_watches.get(dir_path, [])):
+                    try:
+                        await cb(path)
+                    except Exception:
+                        logger.exception(
+                            f"[FileManager] dir callback error for {changed_path}"
+                        )
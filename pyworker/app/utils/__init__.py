@@ -2,11 +2,13 @@
 
 from .logger import get_app_logger, setup_logger, init_app_logger
 from .file_reader import reverse_readline, read_last_n_lines
+from .clock import utcnow
 
 __all__ = [
     "get_app_logger",
     "setup_logger",
     "init_app_logger",
     "reverse_readline",
-    "read_last_n_lines"
+    "read_last_n_lines",
+    "utcnow"
 ]
@@ -0,0 +1,16 @@
+"""Time utilities."""
+
+from datetime import datetime, timezone
+
+
+def utcnow() -> datetime:
+    """
+    Current UTC time as a naive datetime.
+
+    Drop-in for the deprecated datetime.utcnow(); the DB columns and API
+    payloads store naive UTC, so tzinfo is stripped.
+
+    Returns:
+        Naive datetime in UTC
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
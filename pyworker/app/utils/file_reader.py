@@ -6,7 +6,7 @@ from typing import Iterator, Union
 
 def reverse_readline(
     file_path: Union[str, Path],
-    buf_size: int = 8192
+    buf_size: int = 65536
 ) -> Iterator[str]:
     """
     Read a file line by line in reverse order (from end to beginning).
@@ -15,17 +15,17 @@ def reverse_readline(
 
     Args:
         file_path: Path to the file
-        buf_size: Size of buffer for reading chunks (default 8KB)
+        buf_size: Size of buffer for reading chunks (default 64KB)
 
     Yields:
         Lines from the file in reverse order (newest first)
     """
-    file_path = Path(file_path)
-
-    if not file_path.exists():
+    try:
+        f = open(file_path, 'rb')
+    except FileNotFoundError:
         return
 
-    with open(file_path, 'rb') as f:
+    with f:
         # Move to end of file
         f.seek(0, 2)
         position = f.tell()
@@ -74,7 +74,7 @@ def reverse_readline(
 def read_last_n_lines(
     file_path: Union[str, Path],
     n: int,
-    buf_size: int = 8192,
+    buf_size: int = 65536,
     reverse: bool = True
 ) -> list[str]:
     """
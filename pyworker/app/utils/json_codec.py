@@ -0,0 +1,70 @@
+"""JSON encode/decode helpers.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise, so orjson stays an optional speedup rather than a hard dependency.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one name covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Parse JSON from bytes or str.
+
+    Args:
+        data: JSON document
+
+    Returns:
+        Decoded Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, append_newline: bool = False) -> bytes:
+    """
+    Serialize to compact UTF-8 JSON bytes.
+
+    Args:
+        obj: Object to serialize; naive datetimes are written as ISO strings
+        append_newline: Terminate the output with b"\n" (for JSONL records)
+
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        try:
+            if append_newline:
+                # orjson writes the newline into its own buffer, no extra copy
+                return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            # orjson rejects some values the stdlib accepts (e.g. integers wider
+            # than 64 bits in client metadata); retry those with json
+            pass
+    text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default)
+    if append_newline:
+        text += "\n"
+    return text.encode()
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize to a compact JSON string, see dumps()."""
+    return dumps(obj).decode()
+
+
+def _default(obj: Any) -> Any:
+    """Stdlib fallback for types orjson handles natively (datetime, date, time)."""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
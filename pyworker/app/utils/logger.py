@@ -47,7 +47,7 @@ def setup_logger(
     if log_file:
         # Ensure log directory exists
         log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
+        if log_dir:
             os.makedirs(log_dir, exist_ok=True)
 
         file_handler = logging.FileHandler(log_file)
@@ -103,8 +103,11 @@ def get_app_logger() -> logging.Logger:
     Returns:
         Application logger instance
     """
+    global app_logger
+
     if app_logger is None:
-        # Return a default logger if not initialized
-        return setup_logger("pyworker2")
+        # Fall back to a default logger if not initialized, and keep it so
+        # later calls skip setup_logger entirely
+        app_logger = setup_logger("pyworker2")
 
     return app_logger
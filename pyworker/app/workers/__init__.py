@@ -10,3 +10,6 @@ handlers = {
 }
 
 default = "claudecode"
+
+# 可用类型列表（注册表静态，导入时计算一次）
+available_types = tuple(handlers)
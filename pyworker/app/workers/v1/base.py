@@ -1,7 +1,7 @@
 """Worker 抽象基类"""
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Optional, Dict, Any, List
+from typing import TYPE_CHECKING, ClassVar, Optional, Dict, Any, List
 
 from ...models.message import MessageResponse
 
@@ -12,6 +12,13 @@ if TYPE_CHECKING:
 class BaseWorker(ABC):
     """Worker 业务逻辑抽象接口"""
 
+    # 是否支持 session 文件监控（activate_session + _conv_manager_ref），类定义时算一次
+    _watches_sessions: ClassVar[bool] = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._watches_sessions = hasattr(cls, "activate_session") and hasattr(cls, "_conv_manager_ref")
+
     def __init__(self, env_vars: Optional[Dict[str, str]], command_params: Optional[List[str]],
                  file_manager: Optional["FileManager"] = None):
         self.file_manager = file_manager
@@ -61,6 +68,3 @@ class BaseWorker(ABC):
             标准化消息列表
         """
         pass
-
-
-
@@ -1,21 +1,36 @@
 """Claude Code Worker 实现"""
 
 import asyncio
-import json
 import os
 import shutil
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, ClassVar, Optional, Dict, List, Any, Tuple
+from typing import TYPE_CHECKING, ClassVar, Optional, Dict, List, Any, NamedTuple, Tuple
 
 from .base import BaseWorker
 from ...models.message import MessageResponse, MessageContent
 from ...utils.logger import get_app_logger
+from ...utils import json_codec
+from ...utils.clock import utcnow
 
 if TYPE_CHECKING:
     from ...services.file_manager import FileManager
     from ...services.conversation_manager import ConversationManager
 
+logger = get_app_logger()
+
+
+class _SessionCacheEntry(NamedTuple):
+    """会话文件解析缓存条目"""
+
+    ino: int
+    mtime_ns: int
+    size: int
+    offset: int  # 已解析的完整行末尾（字节偏移）
+    complete: List[MessageResponse]  # offset 之前完整行转换出的消息
+    messages: List[MessageResponse]  # complete + 末尾半行的消息
+
 
 class ClaudeCodeWorker(BaseWorker):
     """Claude Code CLI Worker 实现"""
@@ -23,23 +38,55 @@ class ClaudeCodeWorker(BaseWorker):
     # Claude Code stores sessions in ~/.claude/projects/
     CLAUDE_PROJECTS_DIR = Path.home() / ".claude" / "projects"
 
+    # claude 命令的固定前缀参数，拼接 cmd 时直接展开
+    BASE_COMMAND: ClassVar[Tuple[str, ...]] = (
+        "claude", "--print", "--output-format", "json", "--dangerously-skip-permissions"
+    )
+
+    # 子进程管道 StreamReader 的缓冲上限；communicate() 按此大小分块读取，
+    # 调大后大段 JSON 输出只需更少的读循环与唤醒
+    PIPE_READ_LIMIT: ClassVar[int] = 1024 * 1024
+
     # Class-level state for directory watching
     _active_sessions: ClassVar[Dict[str, Tuple[str, str]]] = {}  # raw_id -> (conversation_id, worker_id)
     _file_manager: ClassVar[Optional["FileManager"]] = None
     _conv_manager_ref: ClassVar[Optional["ConversationManager"]] = None
     _watching: ClassVar[bool] = False
 
+    # shutil.which("claude") 结果缓存（只缓存找到的情况，安装后无需重启即可生效）
+    _claude_path: ClassVar[Optional[str]] = None
+
+    # session_id -> 会话文件路径缓存，避免每次同步都遍历全部 project 目录。
+    # 事件循环（watch 回调）和工作线程（_load_messages）都会读写，需持锁
+    SESSION_FILE_CACHE_SIZE: ClassVar[int] = 256
+    _session_files: ClassVar[Dict[str, Path]] = {}
+    _session_files_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    # (projects 目录, mtime_ns, project 子目录列表)，projects 目录未变化时复用
+    _project_dirs: ClassVar[Optional[Tuple[str, int, List[str]]]] = None
+
+    # 会话文件路径 -> 已转换消息及文件状态，文件未变化时跳过重新解析，追加时增量解析。
+    # 按 LRU 淘汰（dict 插入顺序即访问顺序）；_load_messages 在工作线程中运行，读写需持锁
+    MESSAGE_CACHE_SIZE: ClassVar[int] = 64
+    _message_cache: ClassVar[Dict[str, "_SessionCacheEntry"]] = {}
+    _message_cache_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(self, env_vars: Optional[Dict[str, str]] = None,
                  command_params: Optional[List[str]] = None,
                  file_manager: Optional["FileManager"] = None):
         super().__init__(env_vars, command_params, file_manager)
         self.env_vars = env_vars or {}
         self.command_params = command_params or []
-        self.logger = get_app_logger()
         # 首次实例化时自动启动目录监控
         if file_manager is not None:
             self.start_watching(file_manager)
 
+    def _subprocess_env(self) -> Optional[Dict[str, str]]:
+        """子进程环境变量；未配置 env_vars 时返回 None 直接继承父进程环境，免去整份拷贝"""
+        if not self.env_vars:
+            return None
+        return {**os.environ, **self.env_vars}
+
     @classmethod
     def start_watching(cls, file_manager: "FileManager"):
         """启动 ~/.claude/projects 目录监控（幂等）"""
@@ -71,6 +118,11 @@ class ClaudeCodeWorker(BaseWorker):
                 str(cls.CLAUDE_PROJECTS_DIR), cls._on_session_changed
             )
         cls._active_sessions.clear()
+        with cls._session_files_lock:
+            cls._session_files.clear()
+        cls._project_dirs = None
+        with cls._message_cache_lock:
+            cls._message_cache.clear()
         cls._file_manager = None
         cls._conv_manager_ref = None
         cls._watching = False
@@ -83,16 +135,16 @@ class ClaudeCodeWorker(BaseWorker):
         session_id = path.stem
         if session_id not in cls._active_sessions:
             return
+        cls._remember_session_file(session_id, path)
         conversation_id, worker_id = cls._active_sessions[session_id]
-        logger = get_app_logger()
         worker = cls()
         try:
             messages = await worker.fetch_messages(session_id)
             if cls._conv_manager_ref and messages:
-                cls._conv_manager_ref.save_messages(worker_id, conversation_id, messages)
-            logger.info(f"[ClaudeCode] Auto-synced & saved {len(messages)} messages for {session_id}")
+                await asyncio.to_thread(cls._conv_manager_ref.save_messages, worker_id, conversation_id, messages)
+            logger.info("[ClaudeCode] Auto-synced & saved %d messages for %s", len(messages), session_id)
         except Exception:
-            logger.exception(f"[ClaudeCode] Failed to auto-sync {session_id}")
+            logger.exception("[ClaudeCode] Failed to auto-sync %s", session_id)
 
     async def start_conversation(self, path: str, message: str) -> str:
         """
@@ -110,37 +162,37 @@ class ClaudeCodeWorker(BaseWorker):
             raise RuntimeError(f"project_path does not exist: {path}")
 
         # 检查 claude 命令是否存在
-        if shutil.which("claude") is None:
+        if self._find_claude() is None:
             raise RuntimeError("claude command not found in PATH")
 
-        cmd = ["claude", "--print", "--output-format", "json", "--dangerously-skip-permissions"]
-        cmd.append(message)
-        cmd.extend(self.command_params)
+        cmd = [*self.BASE_COMMAND, message, *self.command_params]
 
-        self.logger.info(f"[ClaudeCode] start_conversation: cwd={path}, cmd={' '.join(cmd)}")
+        logger.info("[ClaudeCode] start_conversation: cwd=%s, cmd=%s", path, cmd)
 
         process = await asyncio.create_subprocess_exec(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             cwd=path,
-            env={**os.environ, **self.env_vars}
+            env=self._subprocess_env(),
+            limit=self.PIPE_READ_LIMIT
         )
 
         stdout, stderr = await process.communicate()
 
         if process.returncode != 0:
-            self.logger.error(f"[ClaudeCode] start_conversation failed: {stderr.decode()}")
-            raise RuntimeError(f"Claude Code failed: {stderr.decode()}")
+            err = stderr.decode(errors="replace")
+            logger.error("[ClaudeCode] start_conversation failed: %s", err)
+            raise RuntimeError(f"Claude Code failed: {err}")
 
-        # 解析 JSON 输出，提取 session_id
-        result = json.loads(stdout.decode())
+        # 解析 JSON 输出，提取 session_id（json_codec 直接接受 bytes，无需先 decode）
+        result = json_codec.loads(stdout)
         raw_conversation_id = result.get("session_id", "")
 
         if not raw_conversation_id:
             raise RuntimeError("No session_id in Claude Code response")
 
-        self.logger.info(f"[ClaudeCode] start_conversation success: session_id={raw_conversation_id}")
+        logger.info("[ClaudeCode] start_conversation success: session_id=%s", raw_conversation_id)
         return raw_conversation_id
 
     async def achieve_conversation(self, raw_conversation_id: str) -> bool:
@@ -165,29 +217,45 @@ class ClaudeCodeWorker(BaseWorker):
         Returns:
             是否成功
         """
-        cmd = ["claude", "--print", "--output-format", "json", "--dangerously-skip-permissions", "--resume", raw_conversation_id]
-        cmd.append(message)
-        cmd.extend(self.command_params)
+        cmd = [*self.BASE_COMMAND, "--resume", raw_conversation_id, message, *self.command_params]
 
-        self.logger.info(f"[ClaudeCode] continue_conversation: cwd={path}, cmd={' '.join(cmd)}")
+        logger.info("[ClaudeCode] continue_conversation: cwd=%s, cmd=%s", path, cmd)
 
+        # 回复内容通过会话文件同步，stdout 直接丢弃，不再经管道读入内存
         process = await asyncio.create_subprocess_exec(
             *cmd,
-            stdout=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.PIPE,
             cwd=path,
-            env={**os.environ, **self.env_vars}
+            env=self._subprocess_env(),
+            limit=self.PIPE_READ_LIMIT
         )
 
-        stdout, stderr = await process.communicate()
+        _, stderr = await process.communicate()
 
         if process.returncode != 0:
-            self.logger.error(f"[ClaudeCode] continue_conversation failed: {stderr.decode()}")
-            raise RuntimeError(f"Claude Code failed: {stderr.decode()}")
+            err = stderr.decode(errors="replace")
+            logger.error("[ClaudeCode] continue_conversation failed: %s", err)
+            raise RuntimeError(f"Claude Code failed: {err}")
 
-        self.logger.info(f"[ClaudeCode] continue_conversation success: session_id={raw_conversation_id}")
+        logger.info("[ClaudeCode] continue_conversation success: session_id=%s", raw_conversation_id)
         return True
 
+    @classmethod
+    def _find_claude(cls) -> Optional[str]:
+        """定位 claude 可执行文件（进程内缓存，PATH 在启动后视为不变）"""
+        if cls._claude_path is None:
+            cls._claude_path = shutil.which("claude")
+        return cls._claude_path
+
+    @classmethod
+    def _remember_session_file(cls, session_id: str, session_file: Path):
+        """记录会话文件路径（有界缓存，超出容量时淘汰最早写入的条目）"""
+        with cls._session_files_lock:
+            if session_id not in cls._session_files and len(cls._session_files) >= cls.SESSION_FILE_CACHE_SIZE:
+                cls._session_files.pop(next(iter(cls._session_files)))
+            cls._session_files[session_id] = session_file
+
     def _find_session_file(self, session_id: str) -> Optional[Path]:
         """
         查找 Claude Code 会话文件
@@ -198,18 +266,57 @@ class ClaudeCodeWorker(BaseWorker):
         Returns:
             会话文件路径，未找到返回 None
         """
-        if not self.CLAUDE_PROJECTS_DIR.exists():
-            return None
+        with self._session_files_lock:
+            cached = self._session_files.get(session_id)
+        if cached is not None:
+            if cached.exists():
+                return cached
+            with self._session_files_lock:
+                # 仅移除自己看到的失效条目，不误删并发写入的新路径
+                if self._session_files.get(session_id) == cached:
+                    del self._session_files[session_id]
 
         # Search in all project directories
-        for project_dir in self.CLAUDE_PROJECTS_DIR.iterdir():
-            if project_dir.is_dir():
-                session_file = project_dir / f"{session_id}.jsonl"
-                if session_file.exists():
-                    return session_file
+        # 在缓存的目录列表中未找到时强制重扫一次，避免 mtime 粒度内新建的 project 目录被漏掉
+        file_name = f"{session_id}.jsonl"
+        for refresh in (False, True):
+            for project_dir in self._list_project_dirs(refresh=refresh):
+                session_file = os.path.join(project_dir, file_name)
+                if os.path.isfile(session_file):
+                    session_path = Path(session_file)
+                    self._remember_session_file(session_id, session_path)
+                    return session_path
 
         return None
 
+    @classmethod
+    def _list_project_dirs(cls, refresh: bool = False) -> List[str]:
+        """
+        列出 CLAUDE_PROJECTS_DIR 下的 project 目录
+
+        结果按 projects 目录的 mtime 缓存：新增/删除子目录会更新父目录 mtime，
+        未变化时只需一次 stat，不再 getdents。os.scandir 的 DirEntry.is_dir()
+        复用 d_type，每个目录省一次 stat。
+        """
+        projects_dir = str(cls.CLAUDE_PROJECTS_DIR)
+        try:
+            mtime_ns = os.stat(projects_dir).st_mtime_ns
+        except FileNotFoundError:
+            return []
+
+        cached = cls._project_dirs
+        if not refresh and cached is not None and cached[0] == projects_dir and cached[1] == mtime_ns:
+            return cached[2]
+
+        try:
+            with os.scandir(projects_dir) as it:
+                dirs = [entry.path for entry in it if entry.is_dir()]
+        except FileNotFoundError:
+            return []
+
+        cls._project_dirs = (projects_dir, mtime_ns, dirs)
+        return dirs
+
     async def fetch_messages(self, raw_conversation_id: str) -> List[MessageResponse]:
         """
         从 Claude Code 读取并转换会话消息
@@ -220,24 +327,118 @@ class ClaudeCodeWorker(BaseWorker):
         Returns:
             标准化消息列表
         """
+        # 目录扫描、文件读取与逐条转换都是阻塞操作，放到线程中执行，不占用事件循环
+        return await asyncio.to_thread(self._load_messages, raw_conversation_id)
+
+    def _load_messages(self, raw_conversation_id: str) -> List[MessageResponse]:
+        """同步读取并转换会话消息（在工作线程中调用）"""
         session_file = self._find_session_file(raw_conversation_id)
         if not session_file:
             return []
 
-        messages: List[MessageResponse] = []
-        with open(session_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    try:
-                        data = json.loads(line.strip())
-                        msg = self._convert_raw_message(data)
-                        if msg:
-                            messages.append(msg)
-                    except (json.JSONDecodeError, Exception):
-                        continue
+        cache_key = str(session_file)
+        # mtime 与 size 均未变化时直接复用上次的转换结果；会话文件只追加写入，
+        # 同一文件变大时从上次解析到的完整行末尾继续读，只解析新增部分。
+        # size 不变但 mtime 变了说明被原地改写，与变小/换 inode 一样整体重新解析
+        with open(session_file, "rb") as f:
+            st = os.fstat(f.fileno())
+            cached = self._take_cached_messages(cache_key)
+            if cached is not None and cached.ino == st.st_ino and cached.size == st.st_size \
+                    and cached.mtime_ns == st.st_mtime_ns:
+                self._remember_messages(cache_key, cached)
+                return list(cached.messages)
+            if cached is not None and cached.ino == st.st_ino and st.st_size > cached.size:
+                f.seek(cached.offset)
+                base, offset = cached.complete, cached.offset
+            else:
+                base, offset = [], 0
+            data = f.read()
+
+        # 只有以换行结尾的完整行计入缓存；末尾半行每次重新解析
+        complete_len = data.rfind(b"\n") + 1
+        complete = base + self._convert_records(self._parse_records(data[:complete_len]), session_file)
+        messages = complete + self._convert_records(self._parse_records(data[complete_len:]), session_file)
+
+        self._remember_messages(cache_key, _SessionCacheEntry(
+            ino=st.st_ino,
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            offset=offset + complete_len,
+            complete=complete,
+            messages=messages,
+        ))
+        return list(messages)
+
+    @classmethod
+    def _take_cached_messages(cls, cache_key: str) -> Optional["_SessionCacheEntry"]:
+        """取出缓存条目（命中后由调用方重新放回队尾）"""
+        with cls._message_cache_lock:
+            return cls._message_cache.pop(cache_key, None)
 
+    @classmethod
+    def _remember_messages(cls, cache_key: str, entry: "_SessionCacheEntry"):
+        """写入缓存条目并置于队尾，超出容量时淘汰最久未使用的条目"""
+        with cls._message_cache_lock:
+            cls._message_cache.pop(cache_key, None)
+            while len(cls._message_cache) >= cls.MESSAGE_CACHE_SIZE:
+                cls._message_cache.pop(next(iter(cls._message_cache)))
+            cls._message_cache[cache_key] = entry
+
+    def _convert_records(self, records: List[Any], session_file: Path) -> List[MessageResponse]:
+        """将解析出的记录逐条转换为 MessageResponse，跳过无法转换的记录"""
+        messages: List[MessageResponse] = []
+        for raw in records:
+            try:
+                msg = self._convert_raw_message(raw)
+                if msg:
+                    messages.append(msg)
+            except Exception as e:
+                logger.debug("[ClaudeCode] skip unconvertible record in %s: %s", session_file, e)
+                continue
         return messages
 
+    def _parse_records(self, data: bytes) -> List[Any]:
+        """
+        将 JSONL 内容解析为记录列表
+
+        完整的行拼成一个 JSON 数组交给 json_codec 一次解析（有 orjson 时为单次 C 调用）；
+        批量解析失败时退回逐行解析并跳过坏行。未以换行结尾的最后一行
+        可能是 CLI 正在写入的半行，单独解析，避免拖垮整批。
+
+        Args:
+            data: 会话文件原始内容
+
+        Returns:
+            解析出的 JSON 记录列表（文件顺序）
+        """
+        lines = data.split(b"\n")
+        tail = lines.pop() if not data.endswith(b"\n") else b""
+        # 会话记录都是 JSON 对象：首字节不是 '{' 的行直接跳过，不进解析器、不构造异常
+        lines = [line for line in (raw.strip() for raw in lines) if line[:1] == b"{"]
+
+        records: List[Any] = []
+        if lines:
+            try:
+                records = json_codec.loads(b"[" + b",".join(lines) + b"]")
+            except json_codec.JSONDecodeError:
+                records = [r for r in map(self._parse_line, lines) if r is not None]
+
+        tail = tail.strip()
+        if tail[:1] == b"{":
+            record = self._parse_line(tail)
+            if record is not None:
+                records.append(record)
+
+        return records
+
+    def _parse_line(self, line: bytes) -> Optional[Any]:
+        """解析单行 JSON，失败返回 None（仅 DEBUG 级别记录）"""
+        try:
+            return json_codec.loads(line)
+        except json_codec.JSONDecodeError as e:
+            logger.debug("[ClaudeCode] skip unparsable line: %s", e)
+            return None
+
     def _convert_raw_message(self, raw: Dict[str, Any]) -> Optional[MessageResponse]:
         """Convert a raw Claude Code JSONL entry to MessageResponse."""
         msg_type = raw.get("type", "unknown")
@@ -245,12 +446,11 @@ class ClaudeCodeWorker(BaseWorker):
         if not msg_uuid:
             msg_uuid = f"{msg_type}-{raw.get('timestamp', '')}"
 
-        # Parse timestamp
-        timestamp_str = raw.get("timestamp", "")
+        # Parse timestamp（3.11 起 fromisoformat 直接支持 "Z" 后缀）
         try:
-            timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-        except (ValueError, AttributeError):
-            timestamp = datetime.utcnow()
+            timestamp = datetime.fromisoformat(raw.get("timestamp", ""))
+        except (TypeError, ValueError):
+            timestamp = utcnow()
 
         parent_uuid = raw.get("parentUuid")
         model = None
@@ -273,7 +473,7 @@ class ClaudeCodeWorker(BaseWorker):
                     # Prefer "text" field (text blocks), fall back to "content" (tool_result etc.)
                     raw = block.get("text") or block.get("content", "")
                     if isinstance(raw, list):
-                        raw = json.dumps(raw, ensure_ascii=False)
+                        raw = json_codec.dumps_str(raw)
                     elif not isinstance(raw, str):
                         raw = str(raw)
                     contents.append(MessageContent(
@@ -297,13 +497,13 @@ class ClaudeCodeWorker(BaseWorker):
                         tool_input = block.get("input", {})
                         contents.append(MessageContent(
                             type="tool_use",
-                            content=json.dumps(tool_input, ensure_ascii=False),
+                            content=json_codec.dumps_str(tool_input),
                             tool_name=block.get("name")
                         ))
                     elif block_type == "tool_result":
                         result_content = block.get("content", "")
                         if isinstance(result_content, list):
-                            result_content = json.dumps(result_content, ensure_ascii=False)
+                            result_content = json_codec.dumps_str(result_content)
                         elif not isinstance(result_content, str):
                             result_content = str(result_content)
                         contents.append(MessageContent(
@@ -312,7 +512,7 @@ class ClaudeCodeWorker(BaseWorker):
                             tool_name=block.get("tool_use_id")
                         ))
                     else:
-                        contents.append(MessageContent(type=block_type, content=json.dumps(block, ensure_ascii=False)))
+                        contents.append(MessageContent(type=block_type, content=json_codec.dumps_str(block)))
             elif isinstance(assistant_content, str):
                 contents = [MessageContent(type="text", content=assistant_content)]
 
@@ -8,7 +8,7 @@ from httpx import AsyncClient, ASGITransport
 from fastapi import FastAPI
 
 from app.api.v1 import workers, conversations
-from app.db import DatabaseConnection
+from app.db import DatabaseConnection, ConversationRepository, WorkerRepository
 from app.services import ConversationManager
 from app.services.file_manager import FileManager
 from app.workers.v1.claude import ClaudeCodeWorker
@@ -27,8 +27,8 @@ def _clean_test_db():
 
 
 @pytest.fixture(scope="function")
-async def client():
-    """Create async HTTP client with fresh database for each test."""
+def test_app():
+    """Create a test app with fresh database and shared dependencies on app.state."""
     # Clean database before test
     _clean_test_db()
 
@@ -38,28 +38,33 @@ async def client():
     fm = FileManager()
     fm.start()
 
-    # Inject dependencies into routers
-    workers.db_conn = db_conn
-    conversations.db_conn = db_conn
-    conversations.conv_manager = conv_manager
-    conversations.file_manager = fm
-
     # Create a test app without lifespan (to avoid conflicts)
-    test_app = FastAPI(title="PyWorker2 Test")
-    test_app.include_router(workers.router)
-    test_app.include_router(conversations.router)
+    app = FastAPI(title="PyWorker2 Test")
+    app.include_router(workers.router)
+    app.include_router(conversations.router)
+
+    # Expose dependencies via app.state, same as main.py lifespan
+    app.state.conversation_repo = ConversationRepository(db_conn.conn)
+    app.state.worker_repo = WorkerRepository(db_conn.conn)
+    app.state.conv_manager = conv_manager
+    app.state.file_manager = fm
 
-    @test_app.get("/health")
+    @app.get("/health")
     async def health_check():
         return {"status": "healthy", "version": "1.0.0"}
 
-    # Create client
-    transport = ASGITransport(app=test_app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+    yield app
 
     # Cleanup
     ClaudeCodeWorker.stop_watching()
     fm.stop()
     db_conn.close()
     _clean_test_db()
+
+
+@pytest.fixture(scope="function")
+async def client(test_app):
+    """Create async HTTP client against the test app."""
+    transport = ASGITransport(app=test_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
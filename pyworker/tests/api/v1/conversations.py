@@ -1,7 +1,36 @@
 """Conversation API integration tests."""
 
+import json
+from datetime import datetime
+
 import pytest
 from httpx import AsyncClient
+from starlette.requests import Request
+
+from app.api.v1 import conversations
+from app.db.database_models import ConversationDO
+from app.models.conversation import ConversationResponse
+from app.models.message import MessageResponse, MessageContent
+from app.services import ConversationManager
+from app.utils import json_codec
+from app.workers import handlers
+from app.workers.v1.base import BaseWorker
+
+
+class _StartOnlyWorker(BaseWorker):
+    """Worker stub whose start_conversation succeeds without spawning a CLI."""
+
+    async def start_conversation(self, path, message):
+        return "raw-started"
+
+    async def achieve_conversation(self, raw_conversation_id):
+        return True
+
+    async def continue_conversation(self, raw_conversation_id, path, message):
+        return True
+
+    async def fetch_messages(self, raw_conversation_id):
+        return []
 
 
 _worker_counter = 0
@@ -22,6 +51,18 @@ async def _create_worker(client: AsyncClient, name_prefix: str = "conv-test-work
 class TestConversationAPI:
     """Tests for conversation API endpoints."""
 
+    class TestDependencies:
+        """SUT: get_conversation_repo / get_worker_repo / get_conv_manager / get_file_manager"""
+
+        async def test_read_from_app_state(self, test_app):
+            """Dependencies should hand out the shared objects on app.state."""
+            request = Request({"type": "http", "app": test_app})
+            state = test_app.state
+            assert await conversations.get_conversation_repo(request) is state.conversation_repo
+            assert await conversations.get_worker_repo(request) is state.worker_repo
+            assert await conversations.get_conv_manager(request) is state.conv_manager
+            assert await conversations.get_file_manager(request) is state.file_manager
+
     class TestListConversations:
         """SUT: list_conversations"""
 
@@ -47,6 +88,19 @@ class TestConversationAPI:
             assert data["total"] == 1
             assert len(data["conversations"]) == 1
 
+        async def test_items_match_get(self, client: AsyncClient):
+            """List items should serialize exactly like the single-item endpoint."""
+            worker_name = await _create_worker(client)
+            create_response = await client.post(
+                "/api/v1/conversations",
+                json={"worker_name": worker_name, "project_path": "/tmp", "name": "Listed"}
+            )
+            conversation_id = create_response.json()["id"]
+
+            listed = (await client.get("/api/v1/conversations")).json()["conversations"][0]
+            single = (await client.get(f"/api/v1/conversations/{conversation_id}")).json()
+            assert listed == single
+
         async def test_filter_by_worker(self, client: AsyncClient):
             """Should filter conversations by worker_name."""
             worker1_name = await _create_worker(client)
@@ -70,6 +124,20 @@ class TestConversationAPI:
             assert data["total"] == 1
             assert data["conversations"][0]["worker_name"] == worker1_name
 
+    class TestToJsonDict:
+        """SUT: _to_json_dict"""
+
+        def test_covers_response_fields(self):
+            """The mapping should cover exactly the ConversationResponse fields."""
+            d = conversations._to_json_dict(ConversationDO(id="c1", worker_id="w1", project_path="/tmp"))
+            assert set(d) == set(ConversationResponse.model_fields)
+
+        def test_matches_to_response(self):
+            """_to_response should serialize to the same JSON as the dict path."""
+            conv = ConversationDO(id="c1", worker_id="w1", project_path="/tmp", name="n")
+            assert conversations._to_response(conv).model_dump(mode="json") == \
+                json.loads(json_codec.dumps(conversations._to_json_dict(conv)))
+
     class TestCreateConversation:
         """SUT: create_conversation"""
 
@@ -261,3 +329,114 @@ class TestConversationAPI:
                 json={"new_name": "New Name"}
             )
             assert response.status_code == 404
+
+    class TestCreateInput:
+        """SUT: create_input"""
+
+        async def test_raw_id_saved_when_later_step_fails(self, client: AsyncClient, test_app, monkeypatch):
+            """A started session's raw id must be stored even if saving the input fails."""
+            monkeypatch.setitem(handlers, "startonly", _StartOnlyWorker)
+            await client.post("/api/v1/workers", json={"name": "start-only", "type": "startonly"})
+            create_response = await client.post(
+                "/api/v1/conversations",
+                json={"worker_name": "start-only", "project_path": "/tmp"}
+            )
+            conversation_id = create_response.json()["id"]
+
+            def _fail(*args, **kwargs):
+                raise OSError("disk full")
+            monkeypatch.setattr(test_app.state.conv_manager, "add_input", _fail)
+
+            with pytest.raises(OSError):
+                await client.post(f"/api/v1/conversations/{conversation_id}", json={"role": "user", "content": "hi"})
+
+            stored = test_app.state.conversation_repo.get(conversation_id)
+            assert stored.raw_conversation_id == "raw-started"
+
+    class TestGetConversationMessages:
+        """SUT: get_conversation_messages"""
+
+        async def test_returns_saved_messages(self, client: AsyncClient, test_app):
+            """Stored JSONL lines should come back as a well-formed envelope."""
+            worker_name = await _create_worker(client)
+            create_response = await client.post(
+                "/api/v1/conversations",
+                json={"worker_name": worker_name, "project_path": "/tmp"}
+            )
+            conversation_id = create_response.json()["id"]
+            test_app.state.conv_manager.save_messages(worker_name, conversation_id, [
+                MessageResponse(
+                    uuid="u1", type="user",
+                    contents=[MessageContent(type="text", content="hello")],
+                    timestamp=datetime(2025, 1, 1, 12, 0, 0)
+                )
+            ])
+
+            response = await client.get(f"/api/v1/conversations/{conversation_id}/messages")
+            assert response.status_code == 200
+            data = response.json()
+            assert data["conversation_id"] == conversation_id
+            assert data["total"] == 1
+            assert data["messages"][0]["uuid"] == "u1"
+            assert data["messages"][0]["contents"][0]["content"] == "hello"
+
+        async def test_empty(self, client: AsyncClient):
+            """A conversation without synced messages should return an empty list."""
+            worker_name = await _create_worker(client)
+            create_response = await client.post(
+                "/api/v1/conversations",
+                json={"worker_name": worker_name, "project_path": "/tmp"}
+            )
+            conversation_id = create_response.json()["id"]
+
+            response = await client.get(f"/api/v1/conversations/{conversation_id}/messages")
+            assert response.json() == {"conversation_id": conversation_id, "messages": [], "total": 0}
+
+        async def test_skips_corrupt_line(self, client: AsyncClient, test_app):
+            """A half-written JSONL line should not make the response body invalid JSON."""
+            worker_name = await _create_worker(client)
+            create_response = await client.post(
+                "/api/v1/conversations",
+                json={"worker_name": worker_name, "project_path": "/tmp"}
+            )
+            conversation_id = create_response.json()["id"]
+            manager = test_app.state.conv_manager
+            manager.save_messages(worker_name, conversation_id, [
+                MessageResponse(uuid="u1", type="user", contents=[], timestamp=datetime(2025, 1, 1))
+            ])
+            with open(manager._get_messages_path(worker_name, conversation_id), "a") as f:
+                f.write('{"uuid": "u2", "ty\n')
+
+            response = await client.get(f"/api/v1/conversations/{conversation_id}/messages")
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] == 1
+            assert [m["uuid"] for m in data["messages"]] == ["u1"]
+
+    class TestSafetySync:
+        """SUT: _safety_sync"""
+
+        class _FakeWorker:
+            def __init__(self, messages=None, error=None):
+                self.messages = messages or []
+                self.error = error
+
+            async def fetch_messages(self, raw_conversation_id):
+                if self.error:
+                    raise self.error
+                return self.messages
+
+        async def test_saves_fetched_messages(self, tmp_path):
+            """Fetched messages should be written through the manager."""
+            manager = ConversationManager(str(tmp_path))
+            msg = MessageResponse(uuid="u1", type="user", contents=[], timestamp=datetime(2025, 1, 1))
+            await conversations._safety_sync(self._FakeWorker([msg]), manager, "raw", "w1", "c1234567")
+            assert [m.uuid for m in manager.get_messages("w1", "c1234567")] == ["u1"]
+
+        async def test_swallows_errors(self, tmp_path):
+            """A failing fetch must not raise out of the background task."""
+            manager = ConversationManager(str(tmp_path))
+            await conversations._safety_sync(
+                self._FakeWorker(error=RuntimeError("boom")), manager, "raw", "w1", "c1234567"
+            )
+            assert manager.get_messages("w1", "c1234567") == []
@@ -2,6 +2,9 @@
 
 import pytest
 from httpx import AsyncClient
+from starlette.requests import Request
+
+from app.api.v1 import workers
 
 
 class TestHealthCheck:
@@ -19,6 +22,14 @@ class TestHealthCheck:
 class TestWorkerAPI:
     """Tests for worker API endpoints."""
 
+    class TestGetWorkerRepo:
+        """SUT: get_worker_repo"""
+
+        async def test_read_from_app_state(self, test_app):
+            """The shared repository on app.state should be returned as is."""
+            request = Request({"type": "http", "app": test_app})
+            assert await workers.get_worker_repo(request) is test_app.state.worker_repo
+
     class TestListWorkers:
         """SUT: list_workers"""
 
@@ -149,6 +160,15 @@ class TestWorkerAPI:
             assert "--model" in data["command_params"]
             assert "claude-3" in data["command_params"]
 
+    class TestListWorkerTypes:
+        """SUT: list_worker_types"""
+
+        async def test_types(self, client: AsyncClient):
+            """Should list registered types and the default, not match /{worker_name}."""
+            response = await client.get("/api/v1/workers/types")
+            assert response.status_code == 200
+            assert response.json() == {"types": ["claudecode", "opencode"], "default": "claudecode"}
+
     class TestGetWorker:
         """SUT: get_worker"""
 
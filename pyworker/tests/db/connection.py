@@ -2,6 +2,7 @@
 
 import os
 import shutil
+import duckdb
 import pytest
 from pathlib import Path
 
@@ -59,6 +60,54 @@ class TestDatabaseConnection:
         conn._init_schema()
         conn.close()
 
+    def test_schema_version_recorded(self, db_path):
+        """Init should record the current schema version."""
+        conn = DatabaseConnection(db_path)
+        assert conn._schema_version() == DatabaseConnection.SCHEMA_VERSION
+        conn.close()
+
+    def test_warm_start_skips_ddl(self, db_path):
+        """Reopening at the current version should not rerun the DDL."""
+        conn = DatabaseConnection(db_path)
+        conn.conn.execute("DROP INDEX idx_workers_type")
+        conn.close()
+
+        conn = DatabaseConnection(db_path)
+        index_names = [r[0] for r in conn.conn.execute("SELECT index_name FROM duckdb_indexes()").fetchall()]
+        assert "idx_workers_type" not in index_names
+        conn.close()
+
+    def test_outdated_version_reruns_ddl(self, db_path):
+        """A stale schema version should rerun the DDL and update the version."""
+        conn = DatabaseConnection(db_path)
+        conn.conn.execute("DROP INDEX idx_workers_type")
+        conn.conn.execute("UPDATE schema_meta SET version = 0")
+        conn.close()
+
+        conn = DatabaseConnection(db_path)
+        index_names = [r[0] for r in conn.conn.execute("SELECT index_name FROM duckdb_indexes()").fetchall()]
+        assert "idx_workers_type" in index_names
+        assert conn._schema_version() == DatabaseConnection.SCHEMA_VERSION
+        conn.close()
+
+    def test_pre_versioned_database(self, db_path):
+        """A database created before schema_meta existed should get the column and a version."""
+        raw = duckdb.connect(db_path)
+        raw.execute("""
+            CREATE TABLE conversations (
+                id VARCHAR PRIMARY KEY, worker_id VARCHAR NOT NULL, project_path VARCHAR NOT NULL,
+                name VARCHAR, created_at TIMESTAMP NOT NULL, last_activity TIMESTAMP NOT NULL,
+                is_current BOOLEAN DEFAULT FALSE, metadata JSON
+            )
+        """)
+        raw.close()
+
+        conn = DatabaseConnection(db_path)
+        columns = [r[0] for r in conn.conn.execute("DESCRIBE conversations").fetchall()]
+        assert "raw_conversation_id" in columns
+        assert conn._schema_version() == DatabaseConnection.SCHEMA_VERSION
+        conn.close()
+
     def test_context_manager(self, db_path):
         """Context manager should auto-close connection."""
         with DatabaseConnection(db_path) as conn:
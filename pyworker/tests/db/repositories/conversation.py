@@ -5,7 +5,9 @@ from datetime import datetime, timedelta
 
 from app.db.connection import DatabaseConnection
 from app.db.repositories.conversation import ConversationRepository
+from app.db.repositories.worker import WorkerRepository
 from app.db.database_models.conversation import ConversationDO
+from app.db.database_models.worker import WorkerDO
 
 
 @pytest.fixture
@@ -63,6 +65,32 @@ class TestConversationRepository:
             """get() should return None for non-existent id."""
             assert repo.get("nonexistent") is None
 
+    class TestGetWithWorker:
+        """SUT: ConversationRepository.get_with_worker"""
+
+        def test_returns_both(self, repo, db_conn):
+            """Should return the conversation and its worker from one query."""
+            WorkerRepository(db_conn.conn).create(
+                WorkerDO(id="w1", type="claudecode", env_vars={"A": "1"}, command_params=["--x"])
+            )
+            repo.create(_make_conv())
+            conv, worker = repo.get_with_worker("c1")
+            assert conv.id == "c1"
+            assert worker.id == "w1"
+            assert worker.env_vars == {"A": "1"}
+            assert worker.command_params == ["--x"]
+
+        def test_missing_worker(self, repo):
+            """Worker side should be None when the worker row is gone."""
+            repo.create(_make_conv())
+            conv, worker = repo.get_with_worker("c1")
+            assert conv.id == "c1"
+            assert worker is None
+
+        def test_not_found(self, repo):
+            """Should return (None, None) for non-existent id."""
+            assert repo.get_with_worker("nonexistent") == (None, None)
+
     class TestListAll:
         """SUT: ConversationRepository.list_all"""
 
@@ -122,6 +150,16 @@ class TestConversationRepository:
             old = repo.get("c1")
             assert old.is_current is False
 
+        def test_touches_only_target(self, repo):
+            """Only the new current conversation should get a fresh last_activity."""
+            stale = datetime(2020, 1, 1)
+            repo.create(_make_conv(id="c1", last_activity=stale))
+            repo.create(_make_conv(id="c2", last_activity=stale))
+            repo.switch_current("w1", "c2")
+
+            assert repo.get("c1").last_activity == stale
+            assert repo.get("c2").last_activity > stale
+
     class TestDelete:
         """SUT: ConversationRepository.delete"""
 
@@ -165,7 +203,32 @@ class TestConversationRepository:
             assert repo.update("c1", {"metadata": meta}) is True
             assert repo.get("c1").metadata == meta
 
+        def test_big_int_metadata(self, repo):
+            """Metadata integers wider than 64 bits should round-trip."""
+            repo.create(_make_conv(metadata={"n": 2 ** 70}))
+            assert repo.get("c1").metadata == {"n": 2 ** 70}
+            assert repo.update("c1", {"metadata": {"m": -(2 ** 70)}}) is True
+            assert repo.get("c1").metadata == {"m": -(2 ** 70)}
+
         def test_empty_no_op(self, repo):
             """Updating with empty dict should return True (no-op)."""
             repo.create(_make_conv())
             assert repo.update("c1", {}) is True
+
+    class TestFinalizeInput:
+        """SUT: ConversationRepository.finalize_input"""
+
+        def test_sets_raw_id_and_activity(self, repo):
+            """Should store raw_conversation_id and last_activity together."""
+            repo.create(_make_conv())
+            new_time = datetime(2025, 1, 1, 12, 0, 0)
+            assert repo.finalize_input("c1", "raw-123", new_time) is True
+            result = repo.get("c1")
+            assert result.raw_conversation_id == "raw-123"
+            assert result.last_activity == new_time
+
+        def test_none_keeps_raw_id(self, repo):
+            """Passing None should leave the existing raw_conversation_id alone."""
+            repo.create(_make_conv(raw_conversation_id="raw-old"))
+            assert repo.finalize_input("c1", None, datetime(2025, 1, 1)) is True
+            assert repo.get("c1").raw_conversation_id == "raw-old"
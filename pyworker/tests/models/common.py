@@ -0,0 +1,14 @@
+"""Tests for shared Pydantic models."""
+
+import json
+
+from app.models.common import StatusResponse
+
+
+class TestStatusResponse:
+    """SUT: StatusResponse"""
+
+    def test_json_shape(self):
+        """StatusResponse should serialize status and message."""
+        resp = StatusResponse(status="deleted", message="done")
+        assert json.loads(resp.model_dump_json()) == {"status": "deleted", "message": "done"}
@@ -5,7 +5,10 @@ import pytest
 from datetime import datetime
 from pydantic import ValidationError
 
-from app.models.worker import CreateWorkerRequest, WorkerResponse, WORKER_NAME_PATTERN
+from app.db.database_models import WorkerDO
+from app.models.worker import (
+    CreateWorkerRequest, WorkerResponse, WorkerListResponse, WorkerTypesResponse, WORKER_NAME_PATTERN
+)
 
 
 class TestCreateWorkerRequest:
@@ -63,3 +66,42 @@ class TestWorkerResponse:
         )
         data = json.loads(resp.model_dump_json())
         assert "2025" in data["created_at"]
+
+    def test_from_do(self):
+        """from_do should map WorkerDO.id to name and keep the other fields."""
+        worker = WorkerDO(
+            id="w1", type="claudecode",
+            env_vars={"A": "1"}, command_params=["--x"],
+            created_at=datetime(2025, 6, 15, 10, 0, 0)
+        )
+        resp = WorkerResponse.from_do(worker)
+        assert resp.name == "w1"
+        assert resp.env_vars == {"A": "1"}
+        assert resp.command_params == ["--x"]
+        assert json.loads(resp.model_dump_json())["created_at"] == "2025-06-15T10:00:00"
+
+
+class TestWorkerListResponse:
+    """SUT: WorkerListResponse"""
+
+    def test_json_shape(self):
+        """WorkerListResponse should serialize workers under 'workers' key."""
+        resp = WorkerListResponse(workers=[
+            WorkerResponse(
+                name="w1", type="claudecode",
+                env_vars={}, command_params=[],
+                created_at=datetime(2025, 6, 15, 10, 0, 0)
+            )
+        ])
+        data = json.loads(resp.model_dump_json())
+        assert data["workers"][0]["name"] == "w1"
+
+
+class TestWorkerTypesResponse:
+    """SUT: WorkerTypesResponse"""
+
+    def test_json_shape(self):
+        """WorkerTypesResponse should serialize types and default."""
+        resp = WorkerTypesResponse(types=["claudecode", "opencode"], default="claudecode")
+        data = json.loads(resp.model_dump_json())
+        assert data == {"types": ["claudecode", "opencode"], "default": "claudecode"}
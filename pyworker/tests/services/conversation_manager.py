@@ -1,11 +1,13 @@
 """Tests for ConversationManager service."""
 
 import json
+import shutil
 import pytest
 from datetime import datetime
 
 from app.services.conversation_manager import ConversationManager
 from app.models.message import MessageResponse, MessageContent
+from app.utils.clock import utcnow
 
 
 @pytest.fixture
@@ -42,6 +44,18 @@ class TestConversationManager:
             expected = tmp_path / "myworker" / "ab" / f"{conv_id}.input.jsonl"
             assert expected.exists()
 
+        def test_big_int_metadata(self, manager):
+            """Metadata integers wider than 64 bits should be stored, not rejected."""
+            manager.add_input("w1", "c1234567", "user", "hi", metadata={"n": 2 ** 70})
+            assert manager.get_inputs("w1", "c1234567")[0]["metadata"] == {"n": 2 ** 70}
+
+        def test_recreates_removed_dir(self, manager, tmp_path):
+            """A directory removed at runtime should be recreated on the next write."""
+            manager.add_input("w1", "c1234567", "user", "msg1")
+            shutil.rmtree(tmp_path / "w1")
+            manager.add_input("w1", "c1234567", "user", "msg2")
+            assert len(manager.get_inputs("w1", "c1234567")) == 1
+
     class TestGetInputs:
         """SUT: ConversationManager.get_inputs"""
 
@@ -100,6 +114,17 @@ class TestConversationManager:
             count = manager.save_messages("w1", "c1234567", msgs)
             assert count == 3
 
+        def test_leaves_no_temp_file(self, manager, tmp_path):
+            """Atomic replace should not leave temp files behind."""
+            msgs = [MessageResponse(
+                uuid="u1", type="user",
+                contents=[MessageContent(type="text", content="hi")],
+                timestamp=utcnow()
+            )]
+            manager.save_messages("w1", "c1234567", msgs)
+            files = [p.name for p in (tmp_path / "w1" / "c1").iterdir()]
+            assert files == ["c1234567.messages.jsonl"]
+
     class TestGetMessages:
         """SUT: ConversationManager.get_messages"""
 
@@ -120,6 +145,33 @@ class TestConversationManager:
             """Non-existent messages file should return empty list."""
             assert manager.get_messages("w1", "nonexistent") == []
 
+    class TestGetMessagesRaw:
+        """SUT: ConversationManager.get_messages_raw"""
+
+        def test_returns_serialized_lines(self, manager):
+            """Lines should be the JSON written by save_messages, as read_last_n_lines orders them."""
+            msgs = [
+                MessageResponse(uuid=f"u{i}", type="user", contents=[], timestamp=datetime(2025, 1, 1))
+                for i in range(3)
+            ]
+            manager.save_messages("w1", "c1234567", msgs)
+            lines = manager.get_messages_raw("w1", "c1234567", limit=2)
+            assert [json.loads(line)["uuid"] for line in lines] == ["u2", "u1"]
+            assert lines[0] == msgs[-1].model_dump_json()
+
+        def test_empty(self, manager):
+            """Non-existent messages file should return empty list."""
+            assert manager.get_messages_raw("w1", "nonexistent") == []
+
+        def test_skips_malformed_line(self, manager, tmp_path):
+            """A truncated line should be dropped instead of corrupting the spliced body."""
+            msg = MessageResponse(uuid="u1", type="user", contents=[], timestamp=datetime(2025, 1, 1))
+            manager.save_messages("w1", "c1234567", [msg])
+            path = tmp_path / "w1" / "c1" / "c1234567.messages.jsonl"
+            with open(path, "a") as f:
+                f.write('{"uuid": "u2", "ty\n')
+            assert manager.get_messages_raw("w1", "c1234567") == [msg.model_dump_json()]
+
     class TestDeleteConversation:
         """SUT: ConversationManager.delete_conversation"""
 
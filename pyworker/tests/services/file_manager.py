@@ -1,6 +1,7 @@
 """Tests for FileManager service."""
 
 import asyncio
+import contextlib
 import pytest
 from pathlib import Path
 from unittest.mock import AsyncMock
@@ -96,3 +97,114 @@ class TestFileManager:
 
             fm.unwatch_directory(abs_dir)
             assert abs_dir not in fm._dir_watches
+
+    class TestWatchLoop:
+        """SUT: FileManager._watch_loop"""
+
+        async def test_watches_single_level_with_filter(self, monkeypatch):
+            """awatch should be non-recursive and only pass registered files."""
+            abs_dir = str(Path("/tmp/testdir5").resolve())
+            watched = f"{abs_dir}/watched.txt"
+            captured = {}
+
+            async def fake_awatch(*args, **kwargs):
+                captured.update(kwargs)
+                return
+                yield
+
+            monkeypatch.setattr("app.services.file_manager.awatch", fake_awatch)
+            fm = FileManager()
+            fm._watches[watched] = [AsyncMock()]
+            await fm._watch_loop(abs_dir)
+
+            assert captured["recursive"] is False
+            watch_filter = captured["watch_filter"]
+            assert watch_filter(None, watched) is True
+            assert watch_filter(None, f"{abs_dir}/other.txt") is False
+
+    class TestDirWatchLoop:
+        """SUT: FileManager._dir_watch_loop"""
+
+        async def test_dispatches_changes_to_callback(self, monkeypatch):
+            """Changes should reach the directory callback via the dispatcher."""
+            abs_dir = str(Path("/tmp/testdir3").resolve())
+            changed = f"{abs_dir}/a.jsonl"
+
+            async def fake_awatch(*args, **kwargs):
+                yield {(1, changed)}
+                await asyncio.Event().wait()
+
+            monkeypatch.setattr("app.services.file_manager.awatch", fake_awatch)
+            fm = FileManager()
+            received = []
+            done = asyncio.Event()
+
+            async def cb(path):
+                received.append(path)
+                done.set()
+
+            fm._dir_watches[abs_dir] = [cb]
+            task = asyncio.create_task(fm._dir_watch_loop(abs_dir))
+            await asyncio.wait_for(done.wait(), timeout=1)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            assert received == [Path(changed)]
+
+        async def test_cancel_waits_for_dispatcher(self, monkeypatch):
+            """Cancelling the loop should tear down an in-flight callback before returning."""
+            abs_dir = str(Path("/tmp/testdir5").resolve())
+
+            async def fake_awatch(*args, **kwargs):
+                yield {(1, f"{abs_dir}/a.jsonl")}
+                await asyncio.Event().wait()
+
+            monkeypatch.setattr("app.services.file_manager.awatch", fake_awatch)
+            fm = FileManager()
+            started = asyncio.Event()
+            cleaned_up = []
+
+            async def cb(path):
+                started.set()
+                try:
+                    await asyncio.Event().wait()
+                finally:
+                    # cleanup that itself needs a loop iteration
+                    await asyncio.sleep(0)
+                    cleaned_up.append(path)
+
+            fm._dir_watches[abs_dir] = [cb]
+            task = asyncio.create_task(fm._dir_watch_loop(abs_dir))
+            await asyncio.wait_for(started.wait(), timeout=1)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            assert cleaned_up == [Path(f"{abs_dir}/a.jsonl")]
+
+    class TestDispatchDirChanges:
+        """SUT: FileManager._dispatch_dir_changes"""
+
+        async def test_coalesces_queued_duplicates(self):
+            """Queued events for the same path should trigger one callback."""
+            abs_dir = str(Path("/tmp/testdir4").resolve())
+            fm = FileManager()
+            calls = []
+            done = asyncio.Event()
+
+            async def cb(path):
+                calls.append(path)
+                if path.name == "b.jsonl":
+                    done.set()
+
+            fm._dir_watches[abs_dir] = [cb]
+            queue = asyncio.Queue()
+            for name in ("a.jsonl", "a.jsonl", "a.jsonl", "b.jsonl"):
+                queue.put_nowait(f"{abs_dir}/{name}")
+
+            task = asyncio.create_task(fm._dispatch_dir_changes(abs_dir, queue))
+            await asyncio.wait_for(done.wait(), timeout=1)
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+            assert [p.name for p in calls] == ["a.jsonl", "b.jsonl"]
+
@@ -0,0 +1,17 @@
+"""Clock utility tests."""
+
+from datetime import datetime, timedelta, timezone
+
+from app.utils.clock import utcnow
+
+
+class TestUtcnow:
+    """SUT: utcnow"""
+
+    def test_naive(self):
+        """Result should carry no tzinfo, matching stored timestamps."""
+        assert utcnow().tzinfo is None
+
+    def test_is_utc(self):
+        """Result should be UTC wall time."""
+        assert abs(utcnow() - datetime.now(timezone.utc).replace(tzinfo=None)) < timedelta(seconds=5)
@@ -0,0 +1,52 @@
+"""JSON codec utility tests."""
+
+from datetime import datetime
+
+import pytest
+
+from app.utils import json_codec
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    """Run each test with orjson and with the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return json_codec
+
+
+class TestJsonCodec:
+    """SUT: json_codec"""
+
+    def test_round_trip(self, codec):
+        """dumps/loads should round-trip plain JSON values."""
+        obj = {"a": [1, 2.5, None, True], "b": "中文"}
+        assert codec.loads(codec.dumps(obj)) == obj
+
+    def test_compact_utf8(self, codec):
+        """Output should be compact and keep non-ASCII characters as UTF-8."""
+        assert codec.dumps({"k": "中"}) == '{"k":"中"}'.encode()
+
+    def test_datetime_iso(self, codec):
+        """Naive datetimes should serialize as ISO strings."""
+        assert codec.dumps_str(datetime(2025, 1, 1, 12, 0, 0)) == '"2025-01-01T12:00:00"'
+
+    def test_loads_bytes(self, codec):
+        """loads should accept bytes as well as str."""
+        assert codec.loads(b'{"a":1}') == {"a": 1}
+
+    def test_decode_error(self, codec):
+        """Invalid JSON should raise json_codec.JSONDecodeError."""
+        with pytest.raises(codec.JSONDecodeError):
+            codec.loads(b"{not json")
+
+    def test_big_int(self, codec):
+        """Integers wider than 64 bits should serialize like the stdlib json."""
+        obj = {"n": 2 ** 70}
+        assert codec.dumps(obj) == b'{"n":1180591620717411303424}'
+        assert codec.loads(codec.dumps(obj)) == obj
+
+    def test_append_newline(self, codec):
+        """append_newline should terminate the record with a single newline."""
+        assert codec.dumps({"a": 1}, append_newline=True) == b'{"a":1}\n'
+        assert codec.dumps({"n": 2 ** 70}, append_newline=True) == b'{"n":1180591620717411303424}\n'
@@ -35,3 +35,7 @@ class TestGetAppLogger:
         """Should return a logger even when not explicitly initialized."""
         logger = get_app_logger()
         assert isinstance(logger, logging.Logger)
+
+    def test_default_is_memoized(self):
+        """Repeated calls should return the same logger instance."""
+        assert get_app_logger() is get_app_logger()
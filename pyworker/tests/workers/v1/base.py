@@ -3,6 +3,8 @@
 import pytest
 
 from app.workers.v1.base import BaseWorker
+from app.workers.v1.claude import ClaudeCodeWorker
+from app.workers.v1.opencode import OpenCodeWorker
 
 
 class TestBaseWorker:
@@ -23,3 +25,27 @@ class TestBaseWorker:
 
         with pytest.raises(TypeError):
             PartialWorker(env_vars=None, command_params=None)
+
+    def test_complete_subclass(self):
+        """Full implementation should be instantiable."""
+
+        class CompleteWorker(BaseWorker):
+            async def start_conversation(self, path, message):
+                return "id"
+
+            async def achieve_conversation(self, raw_conversation_id):
+                return True
+
+            async def continue_conversation(self, raw_conversation_id, path, message):
+                return True
+
+            async def fetch_messages(self, raw_conversation_id):
+                return []
+
+        worker = CompleteWorker(env_vars=None, command_params=None)
+        assert worker.file_manager is None
+
+    def test_watches_sessions_flag(self):
+        """Capability flag should be computed once per subclass."""
+        assert ClaudeCodeWorker._watches_sessions is True
+        assert OpenCodeWorker._watches_sessions is False
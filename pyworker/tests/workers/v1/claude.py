@@ -1,6 +1,8 @@
 """Tests for ClaudeCodeWorker."""
 
 import json
+import os
+import threading
 import pytest
 from datetime import datetime
 from pathlib import Path
@@ -14,6 +16,9 @@ def cleanup_class_state():
     """Reset ClaudeCodeWorker class-level state after each test."""
     yield
     ClaudeCodeWorker._active_sessions.clear()
+    ClaudeCodeWorker._session_files.clear()
+    ClaudeCodeWorker._message_cache.clear()
+    ClaudeCodeWorker._project_dirs = None
     ClaudeCodeWorker._file_manager = None
     ClaudeCodeWorker._conv_manager_ref = None
     ClaudeCodeWorker._watching = False
@@ -221,6 +226,214 @@ class TestClaudeCodeWorker:
             result = await worker.fetch_messages(session_id)
             assert len(result) == 1
 
+        @pytest.mark.asyncio
+        async def test_reuses_cache_until_file_changes(self, tmp_path, monkeypatch):
+            """Unchanged file should hit the cache; appended lines should be picked up."""
+            session_file = tmp_path / "s.jsonl"
+            record = {
+                "type": "user", "uuid": "u1",
+                "timestamp": "2025-01-01T12:00:00Z",
+                "message": {"content": "hello"}
+            }
+            session_file.write_text(json.dumps(record) + "\n")
+
+            worker = ClaudeCodeWorker()
+            monkeypatch.setattr(worker, "_find_session_file", lambda sid: session_file)
+
+            first = await worker.fetch_messages("s")
+            monkeypatch.setattr(worker, "_parse_records", lambda data: pytest.fail("cache miss"))
+            assert await worker.fetch_messages("s") == first
+
+            monkeypatch.undo()
+            monkeypatch.setattr(worker, "_find_session_file", lambda sid: session_file)
+            with open(session_file, "a") as f:
+                f.write(json.dumps({**record, "uuid": "u2"}) + "\n")
+            result = await worker.fetch_messages("s")
+            assert [m.uuid for m in result] == ["u1", "u2"]
+
+        @pytest.mark.asyncio
+        async def test_incremental_after_partial_tail(self, tmp_path, monkeypatch):
+            """Appended bytes should be parsed from the last complete line onwards."""
+            session_file = tmp_path / "s.jsonl"
+            first = json.dumps({
+                "type": "user", "uuid": "u1",
+                "timestamp": "2025-01-01T12:00:00Z",
+                "message": {"content": "hello"}
+            })
+            second = json.dumps({
+                "type": "user", "uuid": "u2",
+                "timestamp": "2025-01-01T12:00:01Z",
+                "message": {"content": "again"}
+            })
+            session_file.write_text(first + "\n" + second[:10])
+
+            worker = ClaudeCodeWorker()
+            monkeypatch.setattr(worker, "_find_session_file", lambda sid: session_file)
+            assert [m.uuid for m in await worker.fetch_messages("s")] == ["u1"]
+
+            parsed = []
+            original = worker._parse_records
+            monkeypatch.setattr(worker, "_parse_records", lambda data: parsed.append(data) or original(data))
+            with open(session_file, "a") as f:
+                f.write(second[10:] + "\n")
+
+            assert [m.uuid for m in await worker.fetch_messages("s")] == ["u1", "u2"]
+            assert b"".join(parsed) == (second + "\n").encode()
+
+        @pytest.mark.asyncio
+        async def test_same_size_rewrite_reparses(self, tmp_path, monkeypatch):
+            """An in-place rewrite to the same length should not return stale messages."""
+            session_file = tmp_path / "s.jsonl"
+            record = {
+                "type": "user", "uuid": "u1",
+                "timestamp": "2025-01-01T12:00:00Z",
+                "message": {"content": "hello"}
+            }
+            session_file.write_text(json.dumps(record) + "\n")
+
+            worker = ClaudeCodeWorker()
+            monkeypatch.setattr(worker, "_find_session_file", lambda sid: session_file)
+            assert [m.uuid for m in await worker.fetch_messages("s")] == ["u1"]
+
+            st = session_file.stat()
+            session_file.write_text(json.dumps({**record, "uuid": "u9"}) + "\n")
+            os.utime(session_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            assert session_file.stat().st_size == st.st_size
+
+            assert [m.uuid for m in await worker.fetch_messages("s")] == ["u9"]
+
+        @pytest.mark.asyncio
+        async def test_cache_evicts_least_recently_used(self, tmp_path, monkeypatch):
+            """Message cache should stay bounded and keep recently used files."""
+            monkeypatch.setattr(ClaudeCodeWorker, "MESSAGE_CACHE_SIZE", 2)
+            files = {}
+            for name in ("a", "b", "c"):
+                files[name] = tmp_path / f"{name}.jsonl"
+                files[name].write_text("")
+
+            worker = ClaudeCodeWorker()
+            monkeypatch.setattr(worker, "_find_session_file", lambda sid: files[sid])
+            for sid in ("a", "b", "a", "c"):
+                await worker.fetch_messages(sid)
+
+            assert list(ClaudeCodeWorker._message_cache) == [str(files["a"]), str(files["c"])]
+
+    class TestParseRecords:
+        """SUT: ClaudeCodeWorker._parse_records"""
+
+        def test_batch(self):
+            """Complete lines should be parsed in order."""
+            worker = ClaudeCodeWorker()
+            data = b'{"a": 1}\n{"b": 2}\n'
+            assert worker._parse_records(data) == [{"a": 1}, {"b": 2}]
+
+        def test_bad_line_falls_back(self):
+            """A malformed line should only drop that line."""
+            worker = ClaudeCodeWorker()
+            data = b'{"a": 1}\n{broken\n{"b": 2}\n'
+            assert worker._parse_records(data) == [{"a": 1}, {"b": 2}]
+
+        def test_partial_tail(self):
+            """A half-written last line should be skipped without losing the rest."""
+            worker = ClaudeCodeWorker()
+            data = b'{"a": 1}\n{"b": 2}\n{"c": '
+            assert worker._parse_records(data) == [{"a": 1}, {"b": 2}]
+
+        def test_tail_without_newline(self):
+            """A complete last line without trailing newline should be kept."""
+            worker = ClaudeCodeWorker()
+            data = b'{"a": 1}\n{"b": 2}'
+            assert worker._parse_records(data) == [{"a": 1}, {"b": 2}]
+
+        def test_leading_whitespace(self):
+            """Records indented with whitespace should still be parsed."""
+            worker = ClaudeCodeWorker()
+            data = b'  {"a": 1}\n\t{"b": 2}\n {"c": 3}'
+            assert worker._parse_records(data) == [{"a": 1}, {"b": 2}, {"c": 3}]
+
+    class TestFindSessionFile:
+        """SUT: ClaudeCodeWorker._find_session_file"""
+
+        def test_caches_found_path(self, tmp_path, monkeypatch):
+            """Found session file should be remembered for later lookups."""
+            monkeypatch.setattr(ClaudeCodeWorker, "CLAUDE_PROJECTS_DIR", tmp_path)
+            project_dir = tmp_path / "project"
+            project_dir.mkdir()
+            session_file = project_dir / "s1.jsonl"
+            session_file.write_text("")
+
+            worker = ClaudeCodeWorker()
+            assert worker._find_session_file("s1") == session_file
+            assert ClaudeCodeWorker._session_files["s1"] == session_file
+
+        def test_stale_entry_rescans(self, tmp_path, monkeypatch):
+            """A cached path that no longer exists should fall back to a scan."""
+            monkeypatch.setattr(ClaudeCodeWorker, "CLAUDE_PROJECTS_DIR", tmp_path)
+            project_dir = tmp_path / "project"
+            project_dir.mkdir()
+            session_file = project_dir / "s1.jsonl"
+            session_file.write_text("")
+            ClaudeCodeWorker._session_files["s1"] = tmp_path / "gone" / "s1.jsonl"
+
+            worker = ClaudeCodeWorker()
+            assert worker._find_session_file("s1") == session_file
+
+        def test_project_dirs_cached_until_dir_changes(self, tmp_path, monkeypatch):
+            """Project dir listing should be reused until the projects dir changes."""
+            monkeypatch.setattr(ClaudeCodeWorker, "CLAUDE_PROJECTS_DIR", tmp_path)
+            (tmp_path / "p1").mkdir()
+            assert ClaudeCodeWorker._list_project_dirs() == [str(tmp_path / "p1")]
+
+            monkeypatch.setattr("app.workers.v1.claude.os.scandir", lambda p: pytest.fail("rescanned"))
+            assert ClaudeCodeWorker._list_project_dirs() == [str(tmp_path / "p1")]
+
+            monkeypatch.undo()
+            monkeypatch.setattr(ClaudeCodeWorker, "CLAUDE_PROJECTS_DIR", tmp_path)
+            (tmp_path / "p2").mkdir()
+            assert sorted(ClaudeCodeWorker._list_project_dirs()) == [str(tmp_path / "p1"), str(tmp_path / "p2")]
+
+        def test_bounded(self, monkeypatch):
+            """Cache should evict the oldest entry once full."""
+            monkeypatch.setattr(ClaudeCodeWorker, "SESSION_FILE_CACHE_SIZE", 2)
+            ClaudeCodeWorker._remember_session_file("a", Path("/tmp/a.jsonl"))
+            ClaudeCodeWorker._remember_session_file("b", Path("/tmp/b.jsonl"))
+            ClaudeCodeWorker._remember_session_file("c", Path("/tmp/c.jsonl"))
+            assert list(ClaudeCodeWorker._session_files) == ["b", "c"]
+
+        def test_concurrent_remember(self, monkeypatch):
+            """Concurrent inserts/evictions from several threads should not raise."""
+            monkeypatch.setattr(ClaudeCodeWorker, "SESSION_FILE_CACHE_SIZE", 4)
+            errors = []
+
+            def _hammer(prefix):
+                try:
+                    for i in range(2000):
+                        ClaudeCodeWorker._remember_session_file(f"{prefix}{i}", Path(f"/tmp/{prefix}{i}.jsonl"))
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=_hammer, args=(p,)) for p in "abcd"]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert errors == []
+            assert len(ClaudeCodeWorker._session_files) <= 4
+
+    class TestSubprocessEnv:
+        """SUT: ClaudeCodeWorker._subprocess_env"""
+
+        def test_inherits_when_no_env_vars(self):
+            """Without env_vars the child should inherit the parent env (None)."""
+            assert ClaudeCodeWorker()._subprocess_env() is None
+
+        def test_merges_env_vars(self, monkeypatch):
+            """env_vars should be layered over os.environ."""
+            monkeypatch.setenv("PYWORKER_TEST_BASE", "1")
+            env = ClaudeCodeWorker(env_vars={"FOO": "bar"})._subprocess_env()
+            assert env["FOO"] == "bar"
+            assert env["PYWORKER_TEST_BASE"] == "1"
+
     class TestActivateSession:
         """SUT: ClaudeCodeWorker.activate_session"""
 